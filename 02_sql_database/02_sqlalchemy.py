@@ -7,9 +7,10 @@
 import pandas as pd
 import sqlalchemy as sql
 import os
+from pandas_extensions.database import load_raw_data
 
 # Create a database directory under the root project directory
-os.mkdir(path="00_database")
+os.makedirs(name="00_database", exist_ok=True)
 
 # CREATING A DATABASE ----
 
@@ -26,48 +27,22 @@ engine = sql.create_engine(
 # There is also in-memory database, which is temporary
 conn = engine.connect()
 
-# Read Excel Files
-bikes_df = pd.DataFrame(pd.read_excel("./00_data_raw/bikes.xlsx"))
-bikeshops_df = pd.DataFrame(pd.read_excel("./00_data_raw/bikeshops.xlsx"))
-orderlines_df = pd.DataFrame(pd.read_excel("./00_data_raw/orderlines.xlsx"))
-
-
 # Create Tables
-# Bikes table
-bikes_df.to_sql(
-    name="bikes",
-    con=conn
-)
-# Check to see if bikes table has been created
+# load_raw_data() reads the three Excel files and writes each table with
+# typed columns, chunked executemany() inserts and one transaction per table
+# Unlike to_sql(), it does not write an extra "index" column
+load_raw_data(conn_string=conn)
+
+# Check to see if the tables have been created
 # Use SELECT * FROM statement
 pd.read_sql(
     sql="SELECT * FROM bikes",
     con=conn
 )
-
-# Bikeshop table
-bikeshops_df.to_sql(
-    name="bikeshops",
-    con=conn
-)
-# Check to see if bikes table has been created
-# Use SELECT * FROM statement
 pd.read_sql(
     sql="SELECT * FROM bikeshops",
     con=conn
 )
-
-# Orderlines table
-# Exclude the "unamed 0" column
-# Use ":" to include all rows or columns
-orderlines_df.iloc[:, 1:].to_sql(
-    name="orderlines",
-    con=conn,
-    # Repace the existing table
-    if_exists="replace"
-)
-# Check to see if bikes table has been created
-# Use SELECT * FROM statement
 pd.read_sql(
     sql="SELECT * FROM orderlines",
     con=conn
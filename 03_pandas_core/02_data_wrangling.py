@@ -9,6 +9,10 @@ import matplotlib.pyplot as plt
 from pandas.core.series import Series
 from plotnine.themes.elements import element_blank
 from pandas_extensions.database import collect_data
+from pandas_extensions.groupwise import (
+    standardize, min_max_scale,
+    group_slice, every_kth
+)
 from mizani.formatters import dollar_format
 from plotnine import (
     ggplot, geom_col,
@@ -651,6 +655,21 @@ summary_df_3 = pd.DataFrame(summary_df_3)
     .reset_index()
 )
 
+# Vectorised: group means and standard deviations come from transform()
+# No Python function runs per group, and the rows keep their original order
+standardize(
+    summary_df_3,
+    by="category_2",
+    columns=["total_revenue", "quantity"]
+)
+
+# Same idea for scaling each group to the 0 to 1 range
+min_max_scale(
+    summary_df_3,
+    by="category_2",
+    columns=["total_revenue", "quantity"]
+)
+
 # 5.4 Groupby + Filter
 
 # Last five obs for each group
@@ -693,6 +712,50 @@ summary_df_3 = pd.DataFrame(summary_df_3)
     )
 )
 
+# Vectorised slicing -------------------------------------------
+# - cumcount() numbers the rows within each group, one mask selects every group at once
+
+# Rows 1 to 19 for each group
+group_slice(summary_df_3, by="category_2", start=1, stop=20)
+
+# Every 3rd row for each group
+every_kth(summary_df_3, by="category_2", k=3)
+
+# From the 10th row to the 15th row for each group
+group_slice(summary_df_3, by="category_2", start=10, stop=16)
+
+# Last five obs for each group
+group_slice(summary_df_3, by="category_2", start=-5)
+
+# Benchmark: apply() vs vectorised -------------------------------------------
+# - 200k rows, 20,000 groups
+import time
+
+rng = np.random.default_rng(123)
+n = 200_000
+bench_df = pd.DataFrame({
+    "group": rng.integers(0, 20_000, n),
+    "total_revenue": rng.random(n),
+    "quantity": rng.integers(1, 10, n)
+})
+
+start = time.perf_counter()
+bench_df.groupby("group")[["total_revenue", "quantity"]] \
+    .apply(lambda x: (x - x.mean()) / x.std())
+print(f"apply() standardize: {time.perf_counter() - start:.2f} s")
+
+start = time.perf_counter()
+standardize(bench_df, by="group")
+print(f"standardize(): {time.perf_counter() - start:.2f} s")
+
+start = time.perf_counter()
+bench_df.groupby("group").apply(lambda x: x.iloc[1:20, :])
+print(f"apply() slice: {time.perf_counter() - start:.2f} s")
+
+start = time.perf_counter()
+group_slice(bench_df, by="group", start=1, stop=20)
+print(f"group_slice(): {time.perf_counter() - start:.2f} s")
+
 
 # 6.0 RENAMING -------------------------------------------
 
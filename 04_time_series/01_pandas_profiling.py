@@ -7,10 +7,10 @@ import pandas as pd
 import os as os
 import numpy as np
 from pandas_profiling import profile_report, ProfileReport
-from pandas_extensions.database import collect_data
+from pandas_extensions.database import collect_data_cached
 
 # Pandas Profiling
-df = pd.DataFrame(collect_data())
+df = pd.DataFrame(collect_data_cached())
 
 # Get a Profile
 # This method generate a profile report from a dataset stored as a pandas `DataFrame`
@@ -8,10 +8,11 @@ import numpy as np
 import inspect as insp
 import datetime as dt
 import matplotlib.pyplot as plt
-from pandas_extensions.database import collect_data
+from pandas_extensions.database import collect_data_cached
+from pandas_extensions.timeseries import measure_change, IncrementalAggregator
 
 # Data ------------------------------------
-df = pd.DataFrame(collect_data())
+df = pd.DataFrame(collect_data_cached())
 
 
 # Check timestamp ------------------------------------
@@ -280,6 +281,66 @@ bike_sales_cat2_m_wide_df = pd.DataFrame(
     )
 )
 
+# Vectorised: measure_change() ------------------------------------
+# - One call shifts every column at once, no lambda per series
+
+# Wide data: month-over-month percent change for every category
+measure_change(bike_sales_cat2_m_wide_df, method="pct_change")
+
+# Several methods and lags in one call
+# Columns become (method_lag, category_2), e.g. ("pct_change_12", "Elite Road")
+measure_change(
+    bike_sales_cat2_m_wide_df,
+    method=["diff", "pct_change", "log_return"],
+    lags=[1, 12]
+)
+
+# Change from the first month of each category
+measure_change(bike_sales_cat2_m_wide_df, method="pct_baseline").plot()
+
+# Long data: give the group and date columns, rows can be in any order
+bike_sales_cat2_m_long_df = bike_sales_cat2_m_wide_df \
+    .stack() \
+    .rename("total_revenue") \
+    .reset_index()
+
+bike_sales_cat2_m_long_df.join(
+    measure_change(
+        bike_sales_cat2_m_long_df,
+        value_column="total_revenue",
+        method="diff",
+        groups="category_2",
+        date_column="order_date"
+    )
+    .add_suffix("_diff")
+)
+
+# Benchmark: 50,000 series x 60 months ------------------------------------
+import time
+
+rng = np.random.default_rng(123)
+n_series, n_months = 50_000, 60
+bench_df = pd.DataFrame({
+    "series": np.repeat(np.arange(n_series), n_months),
+    "order_date": np.tile(pd.period_range("2015-01", periods=n_months, freq="M"), n_series),
+    "total_revenue": rng.random(n_series * n_months) + 1
+})
+
+start = time.perf_counter()
+bench_df.groupby("series")["total_revenue"] \
+    .transform(lambda x: (x - x.shift(1)) / x.shift(1))
+print(f"transform(lambda): {time.perf_counter() - start:.2f} s")
+
+start = time.perf_counter()
+measure_change(
+    bench_df,
+    value_column="total_revenue",
+    method="pct_change",
+    groups="series",
+    date_column="order_date"
+)
+print(f"measure_change(): {time.perf_counter() - start:.2f} s")
+
 # CUMULATIVE CALCULATIONS ------------------------------------
 
 # Single time series ------------------------------------
@@ -434,3 +495,53 @@ bike_sales_cat2_m_wide_df = pd.DataFrame(
     .get_legend()
     .set_visible(False)
 )
+
+# INCREMENTAL UPDATES ------------------------------------
+# - Refresh jobs only get a few new months at a time
+# - IncrementalAggregator keeps running sums, counts and the last window of rows per series
+# - Each update() only reads the new rows, the history is not recomputed
+
+# Cumulative and 12 month rolling revenue for every category
+revenue_agg = IncrementalAggregator(window=12, min_periods=1, stats=["sum", "mean"])
+
+# First run: the full history up to the end of 2014
+history_df = revenue_agg.update(bike_sales_cat2_m_wide_df.loc[:"2014-12"])
+
+# Later runs: only the months added since
+new_df = revenue_agg.update(bike_sales_cat2_m_wide_df.loc["2015-01":])
+
+# Same values as expanding() and rolling() over the full history
+pd.concat([history_df, new_df])["expanding_sum"] \
+    .sub(bike_sales_cat2_m_wide_df.expanding().sum()) \
+    .abs() \
+    .max()
+
+# Keep the state between job runs with a pickle
+# pd.to_pickle(revenue_agg, "revenue_agg.pkl")
+# revenue_agg = pd.read_pickle("revenue_agg.pkl")
+
+# Benchmark: one new month for 50,000 series with 10 years of history ------------------------------------
+rng = np.random.default_rng(123)
+history_wide_df = pd.DataFrame(
+    rng.random((120, 50_000)),
+    index=pd.period_range("2010-01", periods=120, freq="M")
+)
+new_month_df = pd.DataFrame(
+    rng.random((1, 50_000)),
+    index=pd.period_range("2020-01", periods=1, freq="M")
+)
+
+bench_agg = IncrementalAggregator(window=12, stats=["sum", "mean"])
+bench_agg.update(history_wide_df)
+
+start = time.perf_counter()
+bench_agg.update(new_month_df)
+print(f"IncrementalAggregator.update(): {time.perf_counter() - start:.3f} s")
+
+start = time.perf_counter()
+full_df = pd.concat([history_wide_df, new_month_df])
+full_df.expanding().sum()
+full_df.expanding().mean()
+full_df.rolling(12).sum()
+full_df.rolling(12).mean()
+print(f"Recompute from scratch: {time.perf_counter() - start:.3f} s")
@@ -8,7 +8,10 @@ import numpy as np
 from pandas.core import groupby
 from pandas.core.series import Series
 
-from my_pandas_extensions.database import collect_data
+from pandas_extensions.database import collect_data, collect_data_chunks
+from pandas_extensions.outliers import (
+    detect_outliers, detect_outliers_grouped, QuantileSketch
+)
 
 
 df = collect_data()
@@ -26,8 +29,91 @@ df = collect_data()
 # 2.0 OUTLIER DETECTION FUNCTION ----
 # - Works with a Pandas Series
 
+# The function lives in pandas_extensions/outliers.py
+# ?detect_outliers
 
+# IQR: outside [Q1 - 1.5 * IQR, Q3 + 1.5 * IQR]
+df[detect_outliers(df["total_revenue"])]
+
+# Z-score and median absolute deviation, with their own default factors
+detect_outliers(df["total_revenue"], method="zscore").sum()
+detect_outliers(df["total_revenue"], method="mad", factor=5).sum()
+
+# Grouped: outliers relative to each category_2 or each bikeshop
+# - Same as groupby().transform(detect_outliers) without a call per group
+df.assign(
+    outlier=detect_outliers_grouped(
+        df,
+        value_column="total_revenue",
+        groups="category_2"
+    )
+) \
+    .query("outlier")
+
+detect_outliers_grouped(df, "total_revenue", "bikeshop_name", method="mad").sum()
+
+# Streaming: approximate quantiles from chunks, memory stays bounded
+sketch = QuantileSketch()
+for chunk in collect_data_chunks(chunksize=5_000):
+    sketch.update(chunk["total_revenue"], groups=chunk["category_2"])
+sketch.quantile([0.25, 0.75])
+
+# Benchmark: 5M rows, 10,000 groups
+import time
+
+rng = np.random.default_rng(123)
+n = 5_000_000
+bench_df = pd.DataFrame({
+    "group": rng.integers(0, 10_000, n),
+    "total_revenue": rng.lognormal(size=n)
+})
+
+start = time.perf_counter()
+bench_df.groupby("group")["total_revenue"].transform(detect_outliers)
+print(f"transform(detect_outliers): {time.perf_counter() - start:.2f} s")
+
+start = time.perf_counter()
+detect_outliers_grouped(bench_df, "total_revenue", "group")
+print(f"detect_outliers_grouped(): {time.perf_counter() - start:.2f} s")
 
 
 # 3.0 EXTENDING A CLASS ----
 
+# Assigning a function to pd.Series would add it to every Series, with no namespace
+# pandas accessors group our helpers under one name instead: df.bikes and series.bikes
+# Importing the module registers them
+import pandas_extensions.accessors
+
+# Summarize by time as a DataFrame method
+df.bikes.summarize_by_time(
+    date_column="order_date",
+    value_column="total_revenue",
+    groups="category_2",
+    rule="M"
+)
+
+# Outliers, overall or within groups
+df.bikes.detect_outliers("total_revenue").sum()
+df.bikes.detect_outliers("total_revenue", groups="bikeshop_name", method="mad").sum()
+
+# Series methods
+total_revenue = df["total_revenue"]
+total_revenue.bikes.detect_outliers(method="zscore").sum()
+
+# Period-over-period change of the monthly summary
+df.bikes.summarize_by_time("order_date", "total_revenue", "category_2", rule="M") \
+    .bikes.measure_change(method="pct_change", lags=[1, 12])
+
+# Results are memoised per frame
+# The second identical call returns the stored result
+import time
+
+start = time.perf_counter()
+df.bikes.summarize_by_time("order_date", "total_revenue", ["category_1", "bikeshop_name"], rule="W")
+print(f"First call: {time.perf_counter() - start:.4f} s")
+
+start = time.perf_counter()
+df.bikes.summarize_by_time("order_date", "total_revenue", ["category_1", "bikeshop_name"], rule="W")
+print(f"Memoised call: {time.perf_counter() - start:.4f} s")
+
+# Changing the columns a helper uses, in place edits with df.loc[] included, recomputes its result
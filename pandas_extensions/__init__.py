@@ -0,0 +1,9 @@
+"""
+Project extensions for pandas.
+
+- database: collect the bike orders data (collect_data() and its variants) and load the raw tables
+- timeseries: summarize values by time period and groups (summarize_by_time()), measure period-over-period change (measure_change()) and keep expanding and rolling aggregates up to date (IncrementalAggregator)
+- outliers: flag outliers in a Series or within groups (detect_outliers(), detect_outliers_grouped()) and approximate quantiles from chunks (QuantileSketch)
+- groupwise: vectorised per-group scaling and slicing (standardize(), min_max_scale(), group_slice(), every_kth())
+- accessors: import to register df.bikes and series.bikes, memoised shortcuts to the helpers above
+"""
@@ -0,0 +1,56 @@
+# IMPORTS ----
+
+import importlib
+
+# Lazy imports ----
+
+
+class LazyModule:
+    """
+
+    Stands in for a module and imports it on first attribute access.
+
+    pandas, numpy and sqlalchemy take most of a second to import together.
+    Loading them lazily keeps `import pandas_extensions.database` cheap for
+    short-lived jobs that may not need all of them.
+
+    The real module is imported the normal way, so other code importing it is not affected.
+
+    Args:
+        name (str): Module name, e.g. "sqlalchemy".
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the proxy itself
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        status = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({status})>"
+
+
+def lazy_import(name):
+    """
+
+    Returns a LazyModule for name, the module is imported on first use.
+
+    Args:
+        name (str): Module name, e.g. "sqlalchemy".
+
+    Returns:
+        LazyModule: Proxy that forwards attribute access to the module
+    """
+    return LazyModule(name)
+
+
+# Shared proxies ----
+
+# pandas and numpy for every module of the package, imported from here so each is set up once
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
@@ -0,0 +1,8 @@
+# Column arguments ----
+
+
+def as_list(value):
+    """Wrap a single name, such as a column or a method, in a list."""
+    if isinstance(value, str):
+        return [value]
+    return list(value)
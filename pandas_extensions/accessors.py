@@ -0,0 +1,273 @@
+# IMPORTS ----
+
+import hashlib
+import weakref
+
+import pandas as pd
+
+from pandas_extensions import outliers, timeseries
+
+# Registered accessor name, df.bikes and series.bikes
+_ACCESSOR_NAME = "bikes"
+
+# Memoised results by id() of the frame or Series: {id(obj): {key: (version, result)}}
+# Some pandas versions build a new accessor on every df.bikes, so the cache cannot live on the accessor
+# Entries are dropped when their object is garbage collected
+_CACHES = {}
+
+# Memoised accessor ----
+
+
+class _MemoizedAccessor:
+    """Shared result cache for the bikes accessors."""
+
+    def __init__(self, pandas_obj):
+        self._obj = pandas_obj
+
+    def clear_cache(self):
+        """
+
+        Drops the memoised results of this object, to free their memory.
+
+        Edits are picked up on their own, in place ones included, so this is never needed for correct results.
+        """
+        _CACHES.pop(id(self._obj), None)
+
+    def _memoize(self, name, func, columns=None, **kwargs):
+        """
+
+        Return func(obj, **kwargs), computed once per set of arguments and content of the columns it uses.
+
+        columns lists the columns func reads, None for every column.
+        Their values and the index are hashed on every call, which costs far less than the helpers.
+        """
+        key = (name, _freeze(kwargs))
+        try:
+            hash(key)
+            version = _version(self._obj, columns)
+        except (TypeError, KeyError):
+            # Arguments such as arrays cannot be keys, and values such as lists cannot be hashed,
+            # compute without memoising. Missing columns get the helper's own error.
+            return func(self._obj, **kwargs)
+
+        cache = self._cache()
+        if key not in cache or cache[key][0] != version:
+            cache[key] = (version, func(self._obj, **kwargs))
+
+        # A copy, so editing the result does not change the cached one
+        return cache[key][1].copy()
+
+    def _cache(self):
+        """Results of this object by key, each stored with the version it was computed from."""
+        obj_id = id(self._obj)
+        if obj_id not in _CACHES:
+            # Forget the results once the object is gone, before its id can be reused
+            weakref.finalize(self._obj, _CACHES.pop, obj_id, None)
+            _CACHES[obj_id] = {}
+        return _CACHES[obj_id]
+
+
+@pd.api.extensions.register_dataframe_accessor(_ACCESSOR_NAME)
+class BikesDataFrameAccessor(_MemoizedAccessor):
+    """
+
+    Project helpers on any DataFrame, as df.bikes.<helper>().
+
+    Results are memoised per frame: calling the same helper with the same arguments
+    returns the stored result until the index or the values of the columns it uses change.
+
+    Example:
+        import pandas_extensions.accessors
+        df.bikes.summarize_by_time("order_date", "total_revenue", groups="category_2", rule="M")
+    """
+
+    def summarize_by_time(
+        self,
+        date_column,
+        value_column,
+        groups=None,
+        rule="D",
+        agg_func="sum",
+        kind="period",
+        wide=True,
+        fillna=0
+    ):
+        """
+
+        Aggregates values by time period and, optionally, by groups.
+
+        See pandas_extensions.timeseries.summarize_by_time().
+        """
+        return self._memoize(
+            "summarize_by_time",
+            timeseries.summarize_by_time,
+            date_column=date_column,
+            value_column=value_column,
+            groups=groups,
+            rule=rule,
+            agg_func=agg_func,
+            kind=kind,
+            wide=wide,
+            fillna=fillna,
+            columns=_columns(date_column, value_column, groups)
+        )
+
+    def measure_change(
+        self,
+        value_column=None,
+        method="diff",
+        lags=1,
+        groups=None,
+        date_column=None
+    ):
+        """
+
+        Measures period-over-period change for many series at once.
+
+        See pandas_extensions.timeseries.measure_change().
+        """
+        return self._memoize(
+            "measure_change",
+            timeseries.measure_change,
+            value_column=value_column,
+            method=method,
+            lags=lags,
+            groups=groups,
+            date_column=date_column,
+            # Without value_column every numeric column is measured
+            columns=None if value_column is None else _columns(value_column, groups, date_column)
+        )
+
+    def detect_outliers(
+        self,
+        value_column,
+        groups=None,
+        method="iqr",
+        factor=None,
+        approx=False
+    ):
+        """
+
+        Flags outliers in a column, within each group if groups is given.
+
+        See pandas_extensions.outliers.detect_outliers() and detect_outliers_grouped().
+
+        Returns:
+            Series: Boolean, same index as the frame, True for outliers.
+        """
+        if groups is None:
+            return self._memoize(
+                "detect_outliers",
+                _column_outliers,
+                value_column=value_column,
+                method=method,
+                factor=factor,
+                approx=approx,
+                columns=_columns(value_column)
+            )
+
+        return self._memoize(
+            "detect_outliers_grouped",
+            outliers.detect_outliers_grouped,
+            value_column=value_column,
+            groups=groups,
+            method=method,
+            factor=factor,
+            approx=approx,
+            columns=_columns(value_column, groups)
+        )
+
+
+@pd.api.extensions.register_series_accessor(_ACCESSOR_NAME)
+class BikesSeriesAccessor(_MemoizedAccessor):
+    """
+
+    Project helpers on any Series, as series.bikes.<helper>().
+
+    Results are memoised per Series, see BikesDataFrameAccessor.
+
+    Example:
+        import pandas_extensions.accessors
+        df["total_revenue"].bikes.detect_outliers(method="mad")
+    """
+
+    def detect_outliers(self, method="iqr", factor=None, approx=False):
+        """
+
+        Flags outliers.
+
+        See pandas_extensions.outliers.detect_outliers().
+        """
+        return self._memoize(
+            "detect_outliers",
+            outliers.detect_outliers,
+            method=method,
+            factor=factor,
+            approx=approx
+        )
+
+    def measure_change(self, method="diff", lags=1):
+        """
+
+        Measures period-over-period change, the rows being in time order.
+
+        See pandas_extensions.timeseries.measure_change().
+
+        Returns:
+            Series or DataFrame: A Series for one method and lag, otherwise a column per method and lag.
+        """
+        return self._memoize(
+            "measure_change",
+            _series_change,
+            method=method,
+            lags=lags
+        )
+
+
+# Helpers ----
+
+
+def _column_outliers(data, value_column, **kwargs):
+    """detect_outliers() on one column of a frame."""
+    return outliers.detect_outliers(data[value_column], **kwargs)
+
+
+def _series_change(series, method, lags):
+    """measure_change() on a Series, through a one-column frame."""
+    name = 0 if series.name is None else series.name
+    change_df = timeseries.measure_change(series.to_frame(name), method=method, lags=lags)
+    if change_df.columns.nlevels == 1:
+        return change_df[name].rename(series.name)
+    return change_df.droplevel(1, axis=1)
+
+
+def _columns(*values):
+    """Column names from arguments that are a column name, a list of them or None, without repeats."""
+    columns = []
+    for value in values:
+        if value is None:
+            continue
+        columns.extend(value if isinstance(value, (list, tuple)) else [value])
+    return list(dict.fromkeys(columns))
+
+
+def _version(obj, columns=None):
+    """Labels, dtypes and a digest of the index and values of the columns used, or of the whole Series."""
+    if isinstance(obj, pd.DataFrame):
+        if columns is not None:
+            obj = obj[columns]
+        labels = (tuple(obj.columns), tuple(str(dtype) for dtype in obj.dtypes))
+    else:
+        labels = (obj.name, str(obj.dtype))
+    # One uint64 per row from the index and the values, stable across calls
+    row_hashes = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+    return labels + (hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest(),)
+
+
+def _freeze(value):
+    """Hashable form of an argument, lists become tuples and dicts sorted tuples."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
@@ -1,125 +1,1515 @@
 # IMPORTS ----
 
-import pandas as pd
-import sqlalchemy as sql
 import os
-from sqlalchemy.engine import create_engine
+import json
+import re
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote, unquote
+from pandas_extensions._lazy import lazy_import
+from pandas_extensions.timeseries import summarize_by_time
+
+# Heavy modules load on first use, see lazy_import()
+pd = lazy_import("pandas")
+np = lazy_import("numpy")
+sql = lazy_import("sqlalchemy")
+asyncio = lazy_import("asyncio")
+concurrent_futures = lazy_import("concurrent.futures")
+
+# Pushdown query ----
+
+# All the columns returned by collect_data(), in output order
+_OUTPUT_COLUMNS = [
+    'order_id',
+    'order_line',
+    'order_date',
+    'quantity',
+    'price',
+    'total_revenue',
+    'model',
+    'category_1',
+    'category_2',
+    'frame_material',
+    'bikeshop_name',
+    'city',
+    'state'
+]
+
+# Rows read per chunk with pushdown=True
+_PUSHDOWN_CHUNKSIZE = 100_000
+
+# Columns taken from the small lookup tables
+# collect_data(pushdown=True) does not join them in SQL, which costs a lookup per row and
+# would return a new Python string per row for the text columns. It returns the lookup keys
+# and attaches these columns from the prepared bikes and bikeshops, text as categoricals
+_BIKES_LOOKUPS = ['price', 'model', 'category_1', 'category_2', 'frame_material']
+_BIKESHOPS_LOOKUPS = ['bikeshop_name', 'city', 'state']
+
+
+def _orderlines_sources(columns):
+    """Orderlines columns needed to build some output columns, in table order."""
+    needed = {_ORDERLINES_SOURCES[col] for col in columns if col in _ORDERLINES_SOURCES}
+    if "order_date" in columns:
+        needed.add("order.date")
+    # Lookup columns only need their key, total_revenue also needs quantity
+    if any(col in _BIKES_LOOKUPS + ["total_revenue"] for col in columns):
+        needed.add("product.id")
+    if "total_revenue" in columns:
+        needed.add("quantity")
+    if any(col in _BIKESHOPS_LOOKUPS for col in columns):
+        needed.add("customer.id")
+    return [col for col in _ORDERLINES_COLUMNS if col in needed]
+
+
+def _orderlines_query(columns, where=""):
+    """Build a query reading only the orderlines columns needed for some output columns."""
+    select = ", ".join(f'"{col}"' for col in _orderlines_sources(columns))
+    return f"SELECT {select} FROM orderlines {where}"
+
+
+def _pushdown_query(columns, start=None, end=None):
+    """Build the pushdown query and its parameters for some output columns and dates."""
+    # Filter and projection run inside SQLite, lookup columns are replaced by their keys
+    # Orderlines columns that are output columns get their output name
+    aliases = {source: col for col, source in _ORDERLINES_SOURCES.items()}
+    aliases["order.date"] = "order_date"
+    select = ",\n    ".join(
+        f'o."{source}" AS "{aliases.get(source, source)}"'
+        for source in _orderlines_sources(columns)
+    )
+    where, params = _date_filter('o."order.date"', start, end)
+    query = f"""
+SELECT
+    {select}
+FROM orderlines AS o
+{where}
+"""
+    return query, params
+
+
+def _date_filter(date_column, start=None, end=None):
+    """Build a WHERE clause and parameters keeping dates in [start, end)."""
+    conditions = []
+    params = {}
+    # Dates are stored as text that sorts like the dates themselves,
+    # so comparing with text in the same layout can use the order.date index
+    if start is not None:
+        conditions.append(f"{date_column} >= :start")
+        params["start"] = pd.Timestamp(start).strftime(_DATE_FORMAT)
+    if end is not None:
+        conditions.append(f"{date_column} < :end")
+        params["end"] = pd.Timestamp(end).strftime(_DATE_FORMAT)
+    if not conditions:
+        return "", params
+    return "WHERE " + " AND ".join(conditions), params
+
 
 # Collect data ----
 
 
 def collect_data(
-    conn_string=f'sqlite://///{os.getcwd()}/00_database/bike_orders_database.sqlite'
+    conn_string=None,
+    pushdown=False,
+    compact=False,
+    start=None,
+    end=None,
+    columns=None,
+    n_jobs=1,
+    backend="pandas"
 ):
     """
 
     Collects and Joins bikes orderlines data.
 
     Args:
-        conn_string ([type], optional): A sqlalchemy connection string to find the database. Defaults to f'sqlite://///{os.getcwd()}/00_database/bike_orders_database.sqlite'.
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. Defaults to None, see default_conn_string().
+        pushdown (bool, optional): If True, SQLite filters dates and selects only the orderlines columns needed, read in chunks. Bikes and bikeshops columns are attached from those small tables, text as categoricals, so no string is fetched per orderline. Lowest peak memory. Defaults to False.
+        compact (bool, optional): If True, pass the result through compact_dtypes() to downcast numbers and turn repeated strings into categoricals. Defaults to False.
+        start (str or Timestamp, optional): Only keep orders on or after this date. Defaults to None, no lower bound.
+        end (str or Timestamp, optional): Only keep orders before this date. Defaults to None, no upper bound.
+        columns (list, optional): Output columns to return, e.g. ["order_date", "total_revenue"]. Only the orderlines columns they need are read, and the other output columns are never computed. Defaults to None, all columns.
+        n_jobs (int, optional): Number of worker processes. Above 1, orderlines is split into rowid ranges that are read, joined and cleaned in parallel. Not used with pushdown=True. On Windows and macOS, call it under if __name__ == "__main__". Defaults to 1.
+        backend (str, optional): How query results become data frames. "pandas" uses pd.read_sql(). "adbc" fetches Arrow record batches with the ADBC SQLite driver and converts them with little copying; it needs adbc-driver-sqlite and pyarrow, and falls back to "pandas" with a warning when they are missing or the database is not a SQLite file. Defaults to "pandas".
 
     Returns:
         Dataframe: A pandas data frame that combines data from tables:
             - bikes: Products information
             - bikeshops: Customers information
             - orderlines: Transactions information
+            model, category_1, category_2, frame_material, city and state are categoricals.
     """
     # Body
 
+    columns = _check_columns(columns)
+    # Checked up front, some paths only pass backend on when they read orderlines
+    _check_backend(backend)
+
     # 1 Connect to database
+    # The engine is created once per connection string and reused, see get_engine()
+    with _connect(conn_string) as conn:
+
+        # Let the database filter and project, then attach the lookup columns chunk by chunk
+        if pushdown:
+            query, params = _pushdown_query(columns, start, end)
+            bikes_df = bikeshops_df = None
+            if any(col in _BIKES_LOOKUPS + ["total_revenue"] for col in columns):
+                bikes_df = _prepare_bikes(_read_table('bikes', conn))
+            if any(col in _BIKESHOPS_LOOKUPS for col in columns):
+                bikeshops_df = _prepare_bikeshops(_read_table('bikeshops', conn))
+
+            # Each chunk is finished as it arrives, so only one chunk of raw rows
+            # and date strings is alive at a time
+            joined_df = pd.concat(
+                [
+                    _finish_pushdown(chunk_df, columns, bikes_df, bikeshops_df)
+                    for chunk_df in _read_sql_chunks(query, conn, params, backend)
+                ],
+                ignore_index=True
+            )
+
+        else:
+            # Retrieve table by hardcoding
+            # This is a good idea here since the raw data will always reside in these 3 tables
+            # Tables will grow but the raw data will be the same
+            # Initialize an empty dictionary container
+            data_dict = {}
+            # For loop to fill the dictionary with table key-value pairs
+            # To examine keys, use data_dict.keys()
+            for table in ['bikes', 'bikeshops']:
+                # Drop index columns that are created
+                data_dict[table] = _read_table(table, conn)
+
+            if n_jobs > 1:
+                # Workers open their own connections, so they only get the url
+                url = conn.engine.url.render_as_string(hide_password=False)
+                rowid_range = conn.execute(
+                    sql.text('SELECT min(rowid), max(rowid) FROM orderlines')
+                ).one()
+            else:
+                # Date filter and projection run in SQL, so orders outside the window
+                # and columns that are not needed are never read
+                where, params = _date_filter('"order.date"', start, end)
+                data_dict['orderlines'] = _drop_index_column(
+                    _read_sql(
+                        _orderlines_query(columns, where),
+                        conn,
+                        params,
+                        backend
+                    )
+                )
+    # Connection is returned to the pool when the with block ends
+
+    if not pushdown:
+        bikes_df = _prepare_bikes(data_dict['bikes'])
+        bikeshops_df = _prepare_bikeshops(data_dict['bikeshops'])
+
+        # 2 and 3 in worker processes, one rowid range each
+        if n_jobs > 1:
+            joined_df = _collect_partitions(
+                url=url,
+                rowid_range=rowid_range,
+                n_jobs=n_jobs,
+                start=start,
+                end=end,
+                bikes_df=bikes_df,
+                bikeshops_df=bikeshops_df,
+                columns=columns
+            )
+
+        else:
+            # 2 Combining tables and 3 Cleaning data
+            # Each output column is built once, straight from the source tables
+            joined_df = _join_and_clean(
+                orderlines_df=data_dict['orderlines'],
+                bikes_df=bikes_df,
+                bikeshops_df=bikeshops_df,
+                columns=columns
+            )
+
+    # 4 Shrink dtypes
+    if compact:
+        joined_df = compact_dtypes(joined_df)
+
+    # 5 Return data frame
+    return joined_df
+
+
+# Arrow fetch ----
+
+
+def _read_sql(query, conn, params=None, backend="pandas"):
+    """Run a query with :name parameters and return a data frame, using the chosen backend."""
+    _check_backend(backend)
+
+    if backend == "adbc":
+        arrow_df = _read_sql_adbc(query, conn, params)
+        if arrow_df is not None:
+            return arrow_df
+
+    return pd.read_sql(
+        sql=sql.text(query),
+        con=conn,
+        params=params
+    )
+
+
+def _read_sql_chunks(query, conn, params=None, backend="pandas"):
+    """Run a query like _read_sql(), yielding data frames of up to _PUSHDOWN_CHUNKSIZE rows."""
+    if backend == "adbc":
+        # Arrow results are already columnar, there are no per-row objects to limit
+        yield _read_sql(query, conn, params, backend)
+        return
+
+    chunks = pd.read_sql(
+        sql=sql.text(query),
+        con=conn,
+        params=params,
+        chunksize=_PUSHDOWN_CHUNKSIZE
+    )
+    empty = True
+    for chunk_df in chunks:
+        empty = False
+        yield chunk_df
+    # Some pandas versions yield nothing for an empty result
+    if empty:
+        yield _read_sql(query, conn, params, backend)
+
+
+def _read_sql_adbc(query, conn, params=None):
+    """Fetch a query as Arrow with the ADBC SQLite driver, or return None if that is not possible."""
+    database = _sqlite_file(conn.engine.url)
+    if database is None:
+        warnings.warn(
+            "backend='adbc' needs a SQLite database file, using backend='pandas'"
+        )
+        return None
+    try:
+        # Optional dependencies, only needed for this backend
+        import adbc_driver_sqlite.dbapi
+    except ImportError:
+        warnings.warn(
+            "backend='adbc' needs adbc-driver-sqlite and pyarrow, using backend='pandas'"
+        )
+        return None
+
+    # ADBC binds positional ? parameters, so swap each :name for ? in order
+    params = params or {}
+    names = re.findall(r":(\w+)", query)
+    query = re.sub(r":(\w+)", "?", query)
+
+    with adbc_driver_sqlite.dbapi.connect(database) as adbc_conn:
+        with adbc_conn.cursor() as cursor:
+            cursor.execute(query, tuple(params[name] for name in names))
+            # Columns arrive as Arrow arrays, numeric ones convert without copying
+            arrow_table = cursor.fetch_arrow_table()
+
+    return arrow_table.to_pandas()
+
+
+# Parallel partitions ----
+
+
+def _collect_partitions(url, rowid_range, n_jobs, start, end, bikes_df, bikeshops_df, columns):
+    """Read, join and clean rowid ranges of orderlines in a process pool and stack the results."""
+    min_rowid, max_rowid = rowid_range
+    # Empty table
+    if min_rowid is None:
+        return _collect_partition(url, 0, -1, start, end, bikes_df, bikeshops_df, columns)
+
+    # Equal width rowid ranges, the last one absorbs the remainder
+    step = (max_rowid - min_rowid) // n_jobs + 1
+    bounds = [
+        (lo, min(lo + step - 1, max_rowid))
+        for lo in range(min_rowid, max_rowid + 1, step)
+    ]
+
+    with concurrent_futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = [
+            executor.submit(
+                _collect_partition, url, lo, hi, start, end, bikes_df, bikeshops_df, columns
+            )
+            for lo, hi in bounds
+        ]
+        partitions = [future.result() for future in futures]
+
+    # Partitions with no rows in the date range have object columns, which would turn every
+    # numeric column to object, so only stack the ones with rows
+    partitions = [df for df in partitions if len(df)] or partitions[:1]
+
+    # Every partition was joined against the same lookup tables,
+    # so the categoricals match and concat keeps them
+    return pd.concat(partitions, ignore_index=True)
+
+
+def _collect_partition(url, lo, hi, start, end, bikes_df, bikeshops_df, columns):
+    """Read one rowid range of orderlines, then join and clean it."""
+    where, params = _date_filter('"order.date"', start, end)
+    where = f"{where} AND" if where else "WHERE"
+    params.update({"lo": lo, "hi": hi})
+
+    # A fresh engine without a pool, connections must not be shared across processes
+    engine = sql.create_engine(url, poolclass=sql.pool.NullPool)
+    with engine.connect() as conn:
+        orderlines_df = _drop_index_column(
+            pd.read_sql(
+                sql=sql.text(
+                    _orderlines_query(columns, f"{where} rowid BETWEEN :lo AND :hi")
+                ),
+                con=conn,
+                params=params
+            )
+        )
+    engine.dispose()
+
+    return _join_and_clean(
+        orderlines_df=orderlines_df,
+        bikes_df=bikes_df,
+        bikeshops_df=bikeshops_df,
+        columns=columns
+    )
+
+
+# Collect data in chunks ----
+
+
+def collect_data_chunks(
+    conn_string=None,
+    chunksize=100_000
+):
+    """
+
+    Collects and Joins bikes orderlines data one chunk of orderlines at a time.
+
+    Args:
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. Defaults to None, see default_conn_string().
+        chunksize (int, optional): Number of orderlines rows per chunk. Defaults to 100_000.
+
+    Yields:
+        Dataframe: A pandas data frame with the same columns as collect_data(), holding at most chunksize rows
+    """
+    # 1 Connect to database
+    # The with block closes the connection even if the caller stops iterating early
+    with _connect(conn_string) as conn:
+        # The two lookup tables are small so we read and split them once and keep them
+        bikes_df = _prepare_bikes(_read_table('bikes', conn))
+        bikeshops_df = _prepare_bikeshops(_read_table('bikeshops', conn))
+
+        # 2 Stream orderlines
+        # With chunksize, read_sql returns an iterator of data frames
+        orderlines_chunks = pd.read_sql(
+            sql='SELECT * FROM orderlines',
+            con=conn,
+            chunksize=chunksize
+        )
+        for orderlines_df in orderlines_chunks:
+            orderlines_df = _drop_index_column(orderlines_df)
+            # 3 Combine and clean each chunk exactly as collect_data() does
+            yield _join_and_clean(
+                orderlines_df=orderlines_df,
+                bikes_df=bikes_df,
+                bikeshops_df=bikeshops_df
+            )
+
+
+# Collect data incrementally ----
+
+
+def collect_data_incremental(
+    cache_path,
+    conn_string=None
+):
+    """
+
+    Collects and Joins bikes orderlines data, only fetching orders that are not in a local cache yet.
+
+    The cache is a pickle of the data frame returned by collect_data().
+    The watermark is the largest order_id in the cache, so new orders are expected to get larger ids.
+
+    Args:
+        cache_path (str or Path): Location of the pickled data frame. It is created on the first call.
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. Defaults to None, see default_conn_string().
+
+    Returns:
+        Dataframe: The cached data frame with any new orders appended, same columns as collect_data()
+    """
+    cache_path = Path(cache_path)
+
+    # 1 Nothing cached yet, so do a full read and save it
+    # An empty cache, e.g. from a first run on an empty database, has no watermark and counts as none
+    cached_df = pd.read_pickle(cache_path) if cache_path.exists() else None
+    if cached_df is None or cached_df.empty:
+        joined_df = collect_data(conn_string=conn_string)
+        joined_df.to_pickle(cache_path)
+        return joined_df
+
+    # 2 Find the watermark
+    watermark = int(cached_df["order_id"].max())
+
+    # 3 Only fetch orderlines past the watermark
+    with _connect(conn_string) as conn:
+        orderlines_df = _drop_index_column(
+            pd.read_sql(
+                sql=sql.text(
+                    'SELECT * FROM orderlines WHERE "order.id" > :watermark'
+                ),
+                con=conn,
+                params={"watermark": watermark}
+            )
+        )
+        # Nothing new, the cache is up to date
+        if orderlines_df.empty:
+            return cached_df
+        bikes_df = _prepare_bikes(_read_table('bikes', conn))
+        bikeshops_df = _prepare_bikeshops(_read_table('bikeshops', conn))
+
+    # 4 Same combine and clean steps as collect_data()
+    new_df = _join_and_clean(
+        orderlines_df=orderlines_df,
+        bikes_df=bikes_df,
+        bikeshops_df=bikeshops_df
+    )
+
+    # 5 Append and save
+    joined_df = pd.concat([cached_df, new_df], ignore_index=True)
+    # New products or shops change the categories, which makes concat fall back to strings
+    joined_df = _as_categories(joined_df)
+    joined_df.to_pickle(cache_path)
+
+    return joined_df
+
+
+# Collect data with an on-disk cache ----
+
+
+def collect_data_cached(
+    conn_string=None,
+    cache_dir=None,
+    file_format="pickle"
+):
+    """
+
+    Collects and Joins bikes orderlines data, reusing a copy saved on disk while the database is unchanged.
+
+    The cache is tied to a fingerprint of the database: the SQLite file's modification time and size, plus the row count of each table.
+    When any of these change, the data is collected again and the cache is rewritten.
+
+    Args:
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. Defaults to None, see default_conn_string().
+        cache_dir (str or Path, optional): Folder holding the cached data frame and its fingerprint. Defaults to None, 00_database/cache in the project folder.
+        file_format (str, optional): One of "pickle", "feather" or "parquet". Feather and parquet need pyarrow. Defaults to "pickle".
+
+    Returns:
+        Dataframe: Same as collect_data()
+    """
+    if file_format not in _CACHE_FORMATS:
+        raise ValueError(
+            f"file_format must be one of {list(_CACHE_FORMATS)}, got {file_format!r}"
+        )
+
+    if cache_dir is None:
+        cache_dir = _PROJECT_DIR / "00_database" / "cache"
+    cache_dir = Path(cache_dir)
+    data_path = cache_dir / f"collect_data.{file_format}"
+    fingerprint_path = cache_dir / "collect_data.json"
+
+    # 1 Fingerprint the database as it is now
+    fingerprint = _fingerprint_database(conn_string)
+    fingerprint["file_format"] = file_format
+
+    # 2 Cache hit: the stored fingerprint matches
+    if data_path.exists() and fingerprint_path.exists():
+        if json.loads(fingerprint_path.read_text()) == fingerprint:
+            read_func, _ = _CACHE_FORMATS[file_format]
+            return read_func(data_path)
+
+    # 3 Cache miss: collect, then write the data before the fingerprint
+    # so a half written cache is never treated as valid
+    joined_df = collect_data(conn_string=conn_string)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _, write_func = _CACHE_FORMATS[file_format]
+    write_func(joined_df, data_path)
+    fingerprint_path.write_text(json.dumps(fingerprint))
+
+    return joined_df
+
+
+# Read and write functions for each cache format
+_CACHE_FORMATS = {
+    "pickle": (lambda path: pd.read_pickle(path), lambda df, path: df.to_pickle(path)),
+    "feather": (lambda path: pd.read_feather(path), lambda df, path: df.to_feather(path)),
+    "parquet": (lambda path: pd.read_parquet(path), lambda df, path: df.to_parquet(path))
+}
+
+
+def _fingerprint_database(conn_string):
+    """Describe the database file and table sizes so changes can be detected."""
+    with _connect(conn_string) as conn:
+        url = conn.engine.url
+        fingerprint = {"conn_string": url.render_as_string(hide_password=True)}
+
+        # File level: modification time and size of the SQLite file
+        database = _sqlite_file(url)
+        if database:
+            stat = os.stat(database)
+            fingerprint["mtime_ns"] = stat.st_mtime_ns
+            fingerprint["size"] = stat.st_size
+
+            # In WAL mode committed writes sit in the -wal file until a checkpoint,
+            # leaving the main file untouched, so the -wal file is part of the state
+            wal_path = f"{database}-wal"
+            if os.path.exists(wal_path):
+                wal_stat = os.stat(wal_path)
+                fingerprint["wal_mtime_ns"] = wal_stat.st_mtime_ns
+                fingerprint["wal_size"] = wal_stat.st_size
+
+        # Table level: row counts catch writes that have not reached the file yet
+        for table in ['bikes', 'bikeshops', 'orderlines']:
+            fingerprint[f"{table}_rows"] = conn.execute(
+                sql.text(f"SELECT COUNT(*) FROM {table}")
+            ).scalar()
+
+    return fingerprint
+
+
+# Collect data asynchronously ----
+
+
+async def collect_data_async(
+    conn_string=None,
+    start=None,
+    end=None,
+    columns=None
+):
+    """
+
+    Collects and Joins bikes orderlines data without blocking the event loop.
+
+    The three tables are read concurrently over an async sqlalchemy engine.
+    The join and cleaning steps run in a worker thread.
+    Needs an async driver such as aiosqlite.
+
+    Args:
+        conn_string (str or AsyncEngine, optional): An async sqlalchemy connection string, or an existing async engine to share. Plain "sqlite://" strings are switched to "sqlite+aiosqlite://". Defaults to None, see default_conn_string().
+        start (str or Timestamp, optional): Only keep orders on or after this date. Defaults to None, no lower bound.
+        end (str or Timestamp, optional): Only keep orders before this date. Defaults to None, no upper bound.
+        columns (list, optional): Output columns to return. Defaults to None, all columns.
+
+    Returns:
+        Dataframe: Same as collect_data()
+    """
+    columns = _check_columns(columns)
+    engine = get_async_engine(conn_string)
+
+    # 1 Read the three tables at the same time, each on its own connection
+    where, params = _date_filter('"order.date"', start, end)
+    bikes_df, bikeshops_df, orderlines_df = await asyncio.gather(
+        _read_sql_async(engine, 'SELECT * FROM bikes'),
+        _read_sql_async(engine, 'SELECT * FROM bikeshops'),
+        _read_sql_async(engine, _orderlines_query(columns, where), params)
+    )
+
+    # 2 Combine and clean off the event loop, this part is CPU bound
+    def combine_and_clean():
+        return _join_and_clean(
+            orderlines_df=_drop_index_column(orderlines_df),
+            bikes_df=_prepare_bikes(_drop_index_column(bikes_df)),
+            bikeshops_df=_prepare_bikeshops(_drop_index_column(bikeshops_df)),
+            columns=columns
+        )
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, combine_and_clean)
+
+
+# One async engine per connection string, like _ENGINES for the sync ones
+_ASYNC_ENGINES = {}
+
+# Rows fetched per await in _read_sql_async()
+_ASYNC_FETCH_SIZE = 10_000
+
+
+def get_async_engine(conn_string, **engine_kwargs):
+    """
+
+    Returns a pooled async sqlalchemy engine for a connection string, creating it on first use.
+
+    Args:
+        conn_string (str or AsyncEngine): An async sqlalchemy connection string, or None for default_conn_string(). Plain "sqlite://" strings are switched to "sqlite+aiosqlite://". An AsyncEngine is returned as is.
+        **engine_kwargs: Passed to create_async_engine() when the engine is first created.
+
+    Returns:
+        AsyncEngine: The shared engine for conn_string
+    """
+    # Imported here so the sync functions work without the async extras installed
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+    if conn_string is None:
+        conn_string = default_conn_string()
+    if isinstance(conn_string, AsyncEngine):
+        return conn_string
+    if conn_string.startswith("sqlite://"):
+        conn_string = "sqlite+aiosqlite://" + conn_string[len("sqlite://"):]
+
+    engine = _ASYNC_ENGINES.get(conn_string)
+    if engine is None:
+        engine = create_async_engine(conn_string, **engine_kwargs)
+        _ASYNC_ENGINES[conn_string] = engine
+    return engine
+
+
+async def dispose_async_engines():
+    """Closes pooled connections and forgets the shared async engines."""
+    while _ASYNC_ENGINES:
+        _, engine = _ASYNC_ENGINES.popitem()
+        await engine.dispose()
+
+
+async def _read_sql_async(engine, query, params=None):
+    """Fetch the rows of a query from an async engine, then build the frame in a worker thread."""
+    async with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            columns, batches = await _fetch_sqlite_async(conn, query, params)
+        else:
+            columns, batches = await _fetch_async(conn, query, params)
+
+    # Building the columns is CPU bound, keep it off the event loop.
+    # One frame per batch, a single from_records() would hold the GIL and stall the loop all the same
+    def build_frame():
+        return pd.concat(
+            [
+                pd.DataFrame.from_records(batch, columns=columns, coerce_float=True)
+                for batch in batches
+            ] or [pd.DataFrame(columns=columns)],
+            ignore_index=True
+        )
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, build_frame)
+
+
+async def _fetch_sqlite_async(conn, query, params):
+    """Fetch column names and batches of rows through the aiosqlite cursor, which builds the rows in its own thread."""
+    raw_conn = await conn.get_raw_connection()
+    # sqlite3 takes the same :name parameters as sql.text()
+    cursor = await raw_conn.driver_connection.execute(query, params or {})
+    try:
+        columns = [col[0] for col in cursor.description]
+        batches = []
+        while True:
+            batch = await cursor.fetchmany(_ASYNC_FETCH_SIZE)
+            if not batch:
+                return columns, batches
+            batches.append(batch)
+    finally:
+        await cursor.close()
+
+
+async def _fetch_async(conn, query, params):
+    """Fetch column names and batches of rows, so the event loop gets control back between batches."""
+    result = await conn.stream(sql.text(query), params or {})
+    columns = list(result.keys())
+    batches = [partition async for partition in result.partitions(_ASYNC_FETCH_SIZE)]
+    return columns, batches
+
+
+# Engines ----
+
+
+# Where the database lives
+# BIKE_ORDERS_DB holds a file path or a full sqlalchemy connection string
+# BIKE_ORDERS_DB_MODE is "rw", "ro" or "immutable", see sqlite_url()
+_DB_ENV_VAR = "BIKE_ORDERS_DB"
+_DB_MODE_ENV_VAR = "BIKE_ORDERS_DB_MODE"
+
+# Project root, the folder holding this package, 00_database and 00_data_raw
+_PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def default_conn_string(mode=None):
+    """
+
+    Returns the connection string used when none is given.
+
+    It is worked out on every call from the BIKE_ORDERS_DB environment variable,
+    falling back to 00_database/bike_orders_database.sqlite in the project folder,
+    so it does not depend on the current working directory.
+
+    Args:
+        mode (str, optional): "rw", "ro" or "immutable", see sqlite_url(). Ignored when BIKE_ORDERS_DB is a full connection string. Defaults to None, the BIKE_ORDERS_DB_MODE environment variable or "rw".
+
+    Returns:
+        str: A sqlalchemy connection string
+    """
+    location = os.environ.get(
+        _DB_ENV_VAR,
+        str(_PROJECT_DIR / "00_database" / "bike_orders_database.sqlite")
+    )
+    # Already a connection string, use it as is
+    if "://" in location:
+        return location
+    if mode is None:
+        mode = os.environ.get(_DB_MODE_ENV_VAR, "rw")
+    return sqlite_url(location, mode=mode)
+
+
+def sqlite_url(path, mode="rw"):
+    """
+
+    Builds a sqlalchemy connection string for a SQLite file.
+
+    - "rw": read and write, the usual mode.
+    - "ro": read only. Many reader processes can share the file and nothing can change it by accident.
+    - "immutable": read only, and SQLite also skips file locking and change detection. Only use it while nothing writes to the file.
 
-    # Engine creation
-    engine = sql.create_engine(conn_string)
-    # Connect to engine
-    conn = engine.connect()
-    # Retrieve table by hardcoding
-    # This is a good idea here since the raw data will always reside in these 3 tables
-    # Tables will grow but the raw data will be the same
-    table_names = ['bikes', 'bikeshops', 'orderlines']
-    # Initialize an empty dictionary container
-    data_dict = {}
-    # For loop to fill the dictionary with table key-value pairs
-    # To examine keys, use data_dict.keys()
-    for table in table_names:
-        data_dict[table] = pd.read_sql(
+    Args:
+        path (str or Path): The SQLite file. Relative paths are taken from the current working directory.
+        mode (str, optional): "rw", "ro" or "immutable". Defaults to "rw".
+
+    Returns:
+        str: A sqlalchemy connection string
+    """
+    path = Path(path).expanduser().resolve().as_posix()
+    if mode == "rw":
+        url = sql.engine.URL.create("sqlite", database=path)
+    # Read only modes need a SQLite URI, uri=true tells the driver to parse it
+    # SQLite decodes the file name, so characters such as # and ? in path are percent-encoded for it
+    elif mode == "ro":
+        url = sql.engine.URL.create(
+            "sqlite",
+            database=f"file:{quote(path)}",
+            query={"mode": "ro", "uri": "true"}
+        )
+    elif mode == "immutable":
+        url = sql.engine.URL.create(
+            "sqlite",
+            database=f"file:{quote(path)}",
+            query={"mode": "ro", "immutable": "1", "uri": "true"}
+        )
+    else:
+        raise ValueError(
+            f'mode must be "rw", "ro" or "immutable", got {mode!r}'
+        )
+    # URL escapes what sqlalchemy itself would read as part of the url, such as # and %
+    return url.render_as_string(hide_password=False)
+
+
+def _sqlite_file(url):
+    """Return the file path of a SQLite url, or None if it is not a SQLite file."""
+    database = url.database
+    if url.get_backend_name() != "sqlite" or not database:
+        return None
+    # URI filenames look like file:/path/to/db
+    if database.startswith("file:"):
+        database = unquote(database[len("file:"):])
+    if not os.path.exists(database):
+        return None
+    return database
+
+
+# One engine per connection string, shared by every call in this process
+# Each engine keeps a pool of open connections, so later calls skip connection setup
+_ENGINES = {}
+
+
+def get_engine(conn_string, **engine_kwargs):
+    """
+
+    Returns a pooled sqlalchemy engine for a connection string, creating it on first use.
+
+    Args:
+        conn_string (str): A sqlalchemy connection string.
+        **engine_kwargs: Passed to sqlalchemy.create_engine() when the engine is first created, e.g. pool_size.
+
+    Returns:
+        Engine: The shared engine for conn_string
+    """
+    engine = _ENGINES.get(conn_string)
+    if engine is None:
+        # pool_pre_ping replaces connections that went stale while sitting in the pool
+        engine_kwargs.setdefault("pool_pre_ping", True)
+        engine = sql.create_engine(conn_string, **engine_kwargs)
+        _ENGINES[conn_string] = engine
+    return engine
+
+
+def dispose_engines(conn_string=None):
+    """
+
+    Closes pooled connections and forgets the shared engines.
+
+    Args:
+        conn_string (str, optional): Only dispose the engine for this connection string. Defaults to None, which disposes all of them.
+    """
+    if conn_string is None:
+        conn_strings = list(_ENGINES)
+    else:
+        conn_strings = [conn_string]
+    for key in conn_strings:
+        engine = _ENGINES.pop(key, None)
+        if engine is not None:
+            engine.dispose()
+
+
+@contextmanager
+def _connect(conn_string):
+    """
+
+    Yields a connection for a connection string, Engine or Connection.
+
+    A Connection passed in is used as is and left open for the caller.
+    """
+    if conn_string is None:
+        conn_string = default_conn_string()
+    if isinstance(conn_string, sql.engine.Connection):
+        yield conn_string
+        return
+    if isinstance(conn_string, sql.engine.Engine):
+        engine = conn_string
+    else:
+        engine = get_engine(conn_string)
+    with engine.connect() as conn:
+        yield conn
+
+
+def _begin(conn):
+    """Start a transaction with conn.begin(), raising a clear error if conn already has one open."""
+    # A Connection passed in autobegins on its first statement, e.g. a SELECT, under SQLAlchemy 2.x
+    if conn.in_transaction():
+        raise ValueError(
+            "The connection already has a transaction open, call commit() or rollback() "
+            "on it first, or pass the engine or connection string instead"
+        )
+    return conn.begin()
+
+
+@contextmanager
+def _write_transaction(conn):
+    """
+
+    Runs the block in one transaction that also covers DDL such as DROP and CREATE TABLE.
+
+    pysqlite only sends BEGIN before INSERT, UPDATE and DELETE, so on its own a DROP TABLE
+    commits straight away. BEGIN IMMEDIATE starts the transaction up front and takes the
+    write lock, so readers keep seeing the old tables until the commit.
+    """
+    with _begin(conn):
+        # Skip when the driver already began, e.g. engines set up with isolation_level=None and a begin event
+        if conn.dialect.name == "sqlite" and not conn.connection.in_transaction:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        yield
+
+
+# Compact dtypes ----
+
+
+def compact_dtypes(
+    df,
+    category_ratio=0.5,
+    arrow_strings=False,
+    verbose=False
+):
+    """
+
+    Shrinks the memory footprint of a data frame by picking smaller dtypes.
+
+    - Integer and float columns are downcast to the smallest type that holds their values.
+    - String columns with few distinct values become categoricals.
+    - Other string columns optionally use Arrow-backed strings.
+
+    Downcast integers can overflow in later arithmetic, e.g. multiplying two int16 columns.
+
+    Args:
+        df (DataFrame): The data frame to shrink. It is not modified.
+        category_ratio (float, optional): A string column becomes a categorical when its number of distinct values is at most this fraction of its length. Defaults to 0.5.
+        arrow_strings (bool, optional): If True, store the remaining string columns as "string[pyarrow]". Needs pyarrow. Defaults to False.
+        verbose (bool, optional): If True, print the memory footprint before and after. Defaults to False.
+
+    Returns:
+        DataFrame: A new data frame with the same values and smaller dtypes
+    """
+    # deep=True counts the Python string objects, not just their pointers
+    memory_before = df.memory_usage(deep=True).sum()
+
+    compact_df = df.copy()
+    for col in compact_df.columns:
+        series = compact_df[col]
+
+        # Numbers: smallest integer or float type that fits
+        if pd.api.types.is_integer_dtype(series.dtype):
+            compact_df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series.dtype):
+            compact_df[col] = pd.to_numeric(series, downcast="float")
+
+        # Strings: categoricals when repeated, otherwise optionally Arrow
+        elif pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                continue
+            if series.nunique(dropna=False) <= category_ratio * len(series):
+                compact_df[col] = series.astype("category")
+            elif arrow_strings:
+                compact_df[col] = series.astype("string[pyarrow]")
+
+    if verbose:
+        memory_after = compact_df.memory_usage(deep=True).sum()
+        print(
+            f"Memory: {memory_before / 1e6:.2f} MB -> {memory_after / 1e6:.2f} MB "
+            f"({1 - memory_after / memory_before:.0%} smaller)"
+        )
+
+    return compact_df
+
+
+# Load data ----
+
+# Column names and SQLite types for each raw table
+# Declared types give every column integer or text affinity instead of whatever to_sql() guesses
+_TABLE_SCHEMAS = {
+    'bikes': {
+        'bike.id': 'INTEGER',
+        'model': 'TEXT',
+        'description': 'TEXT',
+        'price': 'INTEGER'
+    },
+    'bikeshops': {
+        'bikeshop.id': 'INTEGER',
+        'bikeshop.name': 'TEXT',
+        'location': 'TEXT'
+    },
+    'orderlines': {
+        'order.id': 'INTEGER',
+        'order.line': 'INTEGER',
+        'order.date': 'TIMESTAMP',
+        'customer.id': 'INTEGER',
+        'product.id': 'INTEGER',
+        'quantity': 'INTEGER'
+    }
+}
+
+# Indexes for each raw table: (name, columns, unique)
+# The unique indexes are the table keys, the others serve the joins and date filters
+_TABLE_INDEXES = {
+    'bikes': [
+        ('ux_bikes_bike_id', ['bike.id'], True)
+    ],
+    'bikeshops': [
+        ('ux_bikeshops_bikeshop_id', ['bikeshop.id'], True)
+    ],
+    'orderlines': [
+        ('ux_orderlines_order_id_line', ['order.id', 'order.line'], True),
+        ('ix_orderlines_product_id', ['product.id'], False),
+        ('ix_orderlines_customer_id', ['customer.id'], False),
+        ('ix_orderlines_order_date', ['order.date'], False)
+    ]
+}
+
+# Dates are stored as text in the same layout to_sql() used for the original database
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def load_raw_data(
+    conn_string=None,
+    data_dir=None,
+    chunksize=50_000
+):
+    """
+
+    Builds the bikes, bikeshops and orderlines tables from the raw Excel files.
+
+    Args:
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. A Connection must not have a transaction open, commit or roll back first. Defaults to None, see default_conn_string().
+        data_dir (str or Path, optional): Folder holding bikes.xlsx, bikeshops.xlsx and orderlines.xlsx. Defaults to None, 00_data_raw in the project folder.
+        chunksize (int, optional): Number of rows per executemany() call. Defaults to 50_000.
+    """
+    if data_dir is None:
+        data_dir = _PROJECT_DIR / "00_data_raw"
+    data_dir = Path(data_dir)
+    for table in _TABLE_SCHEMAS:
+        # Only keep the schema columns, this drops the "Unnamed: 0" row number in orderlines.xlsx
+        df = pd.read_excel(
+            data_dir / f"{table}.xlsx",
+            usecols=list(_TABLE_SCHEMAS[table])
+        )
+        write_table(df, table, conn_string, chunksize=chunksize)
+
+
+def write_table(
+    data,
+    table,
+    conn_string=None,
+    chunksize=50_000
+):
+    """
+
+    Replaces one of the raw tables with new data in a single transaction.
+
+    The table is created with typed columns and no index column, and its key and lookup indexes are built after the rows are in.
+    Rows are inserted with executemany() in chunks, and the database is switched to WAL mode so readers are not blocked while loading.
+
+    Args:
+        data (DataFrame or iterable of DataFrames): The rows to load, e.g. pd.read_csv(..., chunksize=...) for files too large for memory.
+        table (str): One of "bikes", "bikeshops" or "orderlines".
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. A Connection must not have a transaction open, commit or roll back first. Defaults to None, see default_conn_string().
+        chunksize (int, optional): Number of rows per executemany() call. Defaults to 50_000.
+
+    Returns:
+        int: Number of rows written
+    """
+    if table not in _TABLE_SCHEMAS:
+        raise ValueError(
+            f"table must be one of {list(_TABLE_SCHEMAS)}, got {table!r}"
+        )
+    schema = _TABLE_SCHEMAS[table]
+    columns = ", ".join(f'"{col}"' for col in schema)
+    placeholders = ", ".join("?" for _ in schema)
+
+    # A single data frame is treated as one chunk
+    if isinstance(data, pd.DataFrame):
+        data = [data]
+
+    with _connect(conn_string) as conn:
+        # WAL is stored in the file, so it sticks for later connections
+        # synchronous=NORMAL is safe with WAL and saves an fsync per transaction
+        with _begin(conn):
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+
+        # One transaction for the whole table, so readers never see it half loaded
+        # and a failed load, e.g. a duplicate key in the unique index, keeps the old rows
+        with _write_transaction(conn):
+            # 1 Recreate the table with typed columns
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+            conn.exec_driver_sql(
+                f"CREATE TABLE {table} ("
+                + ", ".join(f'"{col}" {col_type}' for col, col_type in schema.items())
+                + ")"
+            )
+
+            # 2 Insert in chunks of plain Python tuples
+            n_rows = 0
+            insert = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+            for df in data:
+                df = df[list(schema)]
+                for start in range(0, len(df), chunksize):
+                    rows = _to_rows(df.iloc[start:start + chunksize], schema)
+                    conn.exec_driver_sql(insert, rows)
+                    n_rows += len(rows)
+
+            # 3 Build indexes once at the end, cheaper than updating them on every insert
+            _create_table_indexes(conn, table)
+
+    return n_rows
+
+
+def create_indexes(
+    conn_string=None
+):
+    """
+
+    Adds the key and lookup indexes to the raw tables and refreshes the query planner statistics.
+
+    Safe to run more than once, indexes that already exist are kept.
+    Use it on databases built before write_table() created indexes itself.
+
+    Args:
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. A Connection must not have a transaction open, commit or roll back first. Defaults to None, see default_conn_string().
+    """
+    with _connect(conn_string) as conn:
+        with _begin(conn):
+            for table in _TABLE_INDEXES:
+                _create_table_indexes(conn, table)
+
+
+def _create_table_indexes(conn, table):
+    """Create the indexes listed in _TABLE_INDEXES for one table, then ANALYZE it."""
+    for name, columns, unique in _TABLE_INDEXES[table]:
+        index_type = "UNIQUE INDEX" if unique else "INDEX"
+        column_list = ", ".join(f'"{col}"' for col in columns)
+        conn.exec_driver_sql(
+            f"CREATE {index_type} IF NOT EXISTS {name} ON {table} ({column_list})"
+        )
+    # ANALYZE gives the planner row counts so it picks the indexes for joins
+    conn.exec_driver_sql(f"ANALYZE {table}")
+
+
+def _to_rows(df, schema):
+    """Convert a data frame to a list of tuples that sqlite3 can bind."""
+    columns = []
+    for col, col_type in schema.items():
+        if col_type == 'TIMESTAMP':
+            # Few distinct dates, so format each one once and map back with the codes
+            # Missing dates get code -1, which picks the None added at the end
+            codes, dates = pd.factorize(pd.to_datetime(df[col]))
+            formatted = np.append(
+                dates.strftime(_DATE_FORMAT).to_numpy(dtype=object),
+                None
+            )
+            values = pd.Series(formatted[codes], index=df.index)
+        else:
+            values = df[col]
+        # tolist() gives Python scalars, sqlite3 cannot bind numpy ones
+        # Missing values become None so they are stored as NULL
+        columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+# Daily rollup ----
+
+# Table holding one row per day and product/shop dimensions
+_ROLLUP_TABLE = "orderlines_daily"
+
+# instr() finds the first " - " / ", " separator and substr() slices around it
+_DESCRIPTION_REST = "substr(b.description, instr(b.description, ' - ') + 3)"
+
+# SQL expression for each dimension kept in the rollup, grouped by in SQLite
+# All are fixed per product or per shop so there are few combinations
+_ROLLUP_GROUP_EXPRESSIONS = {
+    'category_1': "substr(b.description, 1, instr(b.description, ' - ') - 1)",
+    'category_2': f"substr({_DESCRIPTION_REST}, 1, instr({_DESCRIPTION_REST}, ' - ') - 1)",
+    'frame_material': f"substr({_DESCRIPTION_REST}, instr({_DESCRIPTION_REST}, ' - ') + 3)",
+    'bikeshop_name': 's."bikeshop.name"',
+    'city': "substr(s.location, 1, instr(s.location, ', ') - 1)",
+    'state': "substr(s.location, instr(s.location, ', ') + 2)"
+}
+_ROLLUP_GROUPS = list(_ROLLUP_GROUP_EXPRESSIONS)
+
+# Additive measures, coarser periods are sums of the daily values
+_ROLLUP_VALUES = {
+    'quantity': 'SUM(o.quantity)',
+    'total_revenue': 'SUM(o.quantity * b.price)',
+    'orderlines': 'COUNT(*)'
+}
+
+
+def build_daily_rollup(conn_string=None):
+    """
+
+    Builds the orderlines_daily table: quantity, revenue and orderline counts per day, product category and bikeshop.
+
+    Run it after each refresh of the raw tables. Dashboards then read the rollup with collect_rollup(),
+    which touches thousands of daily rows instead of every orderline.
+
+    Args:
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. A Connection must not have a transaction open, commit or roll back first. Defaults to None, see default_conn_string().
+
+    Returns:
+        int: Number of rows in the rollup
+    """
+    group_exprs = [f"{expr} AS {col}" for col, expr in _ROLLUP_GROUP_EXPRESSIONS.items()]
+    value_exprs = [f"{expr} AS {col}" for col, expr in _ROLLUP_VALUES.items()]
+    # date() drops the time of day, leaving YYYY-MM-DD
+    select = ",\n    ".join(
+        ['date(o."order.date") AS order_date'] + group_exprs + value_exprs
+    )
+    # Group by output position, 1 is the date and 2 onwards are the dimensions
+    group_by = ", ".join(str(i) for i in range(1, len(_ROLLUP_GROUPS) + 2))
+
+    with _connect(conn_string) as conn:
+        # Rebuilt in one transaction so readers see either the old or the new rollup
+        # and a failed rebuild keeps the old one, see _write_transaction()
+        with _write_transaction(conn):
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {_ROLLUP_TABLE}")
+            conn.exec_driver_sql(f"""
+CREATE TABLE {_ROLLUP_TABLE} AS
+SELECT
+    {select}
+FROM orderlines AS o
+LEFT JOIN bikes AS b
+    ON o."product.id" = b."bike.id"
+LEFT JOIN bikeshops AS s
+    ON o."customer.id" = s."bikeshop.id"
+GROUP BY {group_by}
+""")
+            conn.exec_driver_sql(
+                f"CREATE INDEX ix_{_ROLLUP_TABLE}_order_date ON {_ROLLUP_TABLE} (order_date)"
+            )
+            n_rows = conn.execute(
+                sql.text(f"SELECT COUNT(*) FROM {_ROLLUP_TABLE}")
+            ).scalar()
+
+    return n_rows
+
+
+def collect_rollup(
+    rule="D",
+    groups=None,
+    value_column="total_revenue",
+    conn_string=None,
+    start=None,
+    end=None,
+    kind="period",
+    wide=True
+):
+    """
+
+    Summarizes quantity, revenue or orderline counts by period and groups from the daily rollup.
+
+    Gives the same numbers as summarize_by_time(collect_data(), ...) with agg_func="sum",
+    but reads the pre-aggregated orderlines_daily table built by build_daily_rollup().
+
+    Args:
+        rule (str, optional): Period frequency, e.g. "D", "W", "M", "Q" or "Y". Defaults to "D".
+        groups (str or list, optional): Any of category_1, category_2, frame_material, bikeshop_name, city and state. Defaults to None.
+        value_column (str or list, optional): Any of quantity, total_revenue and orderlines. Defaults to "total_revenue".
+        conn_string (str, Engine or Connection, optional): A sqlalchemy connection string to find the database, or an existing engine or connection to share. Defaults to None, see default_conn_string().
+        start (str or Timestamp, optional): Only keep days on or after this date. Defaults to None, no lower bound.
+        end (str or Timestamp, optional): Only keep days before this date. Defaults to None, no upper bound.
+        kind (str, optional): "period" or "timestamp", see summarize_by_time(). Defaults to "period".
+        wide (bool, optional): If True, pivot the groups into columns. Defaults to True.
+
+    Returns:
+        DataFrame: Same layout as summarize_by_time()
+    """
+    groups = [] if groups is None else [groups] if isinstance(groups, str) else list(groups)
+    values = [value_column] if isinstance(value_column, str) else list(value_column)
+    unknown = [col for col in groups if col not in _ROLLUP_GROUPS] + \
+        [col for col in values if col not in _ROLLUP_VALUES]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns {unknown}, groups must be in {_ROLLUP_GROUPS} "
+            f"and value_column in {list(_ROLLUP_VALUES)}"
+        )
+
+    # 1 Collapse the unused dimensions in SQL, still one row per day
+    select = ", ".join(
+        ["order_date"] + groups + [f"SUM({col}) AS {col}" for col in values]
+    )
+    group_by = ", ".join(["order_date"] + groups)
+    where = []
+    params = {}
+    if start is not None:
+        where.append("order_date >= :start")
+        params["start"] = pd.Timestamp(start).strftime("%Y-%m-%d")
+    if end is not None:
+        where.append("order_date < :end")
+        params["end"] = pd.Timestamp(end).strftime("%Y-%m-%d")
+    where = f"WHERE {' AND '.join(where)}" if where else ""
+
+    with _connect(conn_string) as conn:
+        daily_df = pd.read_sql(
+            sql=sql.text(
+                f"SELECT {select} FROM {_ROLLUP_TABLE} {where} GROUP BY {group_by}"
+            ),
+            con=conn,
+            params=params
+        )
+    daily_df["order_date"] = pd.to_datetime(daily_df["order_date"], format="%Y-%m-%d")
+    # Same group dtypes as collect_data() so the columns match
+    daily_df = _as_categories(daily_df)
+
+    # 2 Re-aggregate the daily sums to the requested period
+    return summarize_by_time(
+        daily_df,
+        date_column="order_date",
+        value_column=value_column,
+        groups=groups or None,
+        rule=rule,
+        agg_func="sum",
+        kind=kind,
+        wide=wide
+    )
+
+
+# Helpers ----
+
+
+def _check_columns(columns):
+    """Return the requested output columns, all of them if None, or raise on unknown names or an empty list."""
+    if columns is None:
+        return _OUTPUT_COLUMNS
+    if len(columns) == 0:
+        raise ValueError(
+            f"columns must name at least one column, choose from {_OUTPUT_COLUMNS}"
+        )
+    unknown = [col for col in columns if col not in _OUTPUT_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns {unknown}, choose from {_OUTPUT_COLUMNS}"
+        )
+    return list(columns)
+
+
+def _check_backend(backend):
+    """Raise if backend is not one of the fetch backends."""
+    if backend not in ("pandas", "adbc"):
+        raise ValueError(
+            f'backend must be "pandas" or "adbc", got {backend!r}'
+        )
+
+
+def _read_table(table, conn):
+    """Read a whole table and drop the index column created by to_sql()."""
+    return _drop_index_column(
+        pd.read_sql(
             sql=f'SELECT * FROM {table}',
             con=conn
-            # Drop index columns that are created
-        ).drop(labels='index', axis=1)
-    # Close connection
-    conn.close()
-
-    # 2 Combining tables
-
-    joined_df = (data_dict['orderlines']
-                 # Left join bikes data onto orderlines data
-                 .merge(
-        right=data_dict['bikes'],
-        how="left",
-        left_on="product.id",
-        right_on="bike.id"
+        )
     )
-        # Left join bikeship data on to the resultant data
-        .merge(
-            right=data_dict["bikeshops"],
-            how="left",
-            left_on="customer.id",
-            right_on="bikeshop.id"
-    ))
 
-    # 3 Cleaning data
-    # Subset and assignment to turn data column to date time object
-    joined_df["order.date"] = pd.to_datetime(
-        joined_df["order.date"]
-    )
-    # Now subset multiple elements and assign
+
+def _drop_index_column(df):
+    """Drop the index column written by to_sql(), if there is one."""
+    return df.drop(labels='index', axis=1, errors='ignore')
+
+
+def _prepare_bikes(bikes_df):
+    """Split description and store the text columns as categoricals."""
+    # The split runs once per product instead of once per orderline
     # Split description column into separate columns
-    joined_df[[
+    bikes_df[[
         "category_1",
         "category_2",
         "frame_material"
-    ]] = (joined_df["description"]
+    ]] = (bikes_df["description"]
           .str.split(
         pat=" - ",
         expand=True
     ))
+    # The join copies the categorical codes, not the strings
+    return _as_categories(bikes_df.drop(labels="description", axis=1))
+
+
+def _prepare_bikeshops(bikeshops_df):
+    """Split location and store the text columns as categoricals."""
     # Split Location into City and State
-    joined_df[[
+    bikeshops_df[[
         "city",
         "state"
-    ]] = (joined_df["location"]
+    ]] = (bikeshops_df["location"]
           .str.split(
         pat=", ",
         expand=True
     ))
-    # Compute total revenue
-    joined_df[
-        "total_revenue"
-    ] = joined_df.quantity * joined_df.price
-    # Modify on copy is carried out here when we reorganize the columns
-    joined_df = joined_df[[
-        'order.id',
-        'order.line',
-        'order.date',
-        'quantity',
-        'price',
-        'total_revenue',
-        'model',
-        'category_1',
-        'category_2',
-        'frame_material',
-        'bikeshop.name',
-        'city',
-        'state'
-    ]]
-    # Replace all "." with "_"
-    joined_df.columns = joined_df.columns.str.replace(
-        pat=".",
-        repl="_",
-        # False, treats the pattern "." as a literal string and not "find all"
-        # True, assumes the passed-in pattern is a regular expression
-        regex=False
+    return _as_categories(bikeshops_df.drop(labels="location", axis=1))
+
+
+# Text columns returned as categoricals, there are few distinct values per column
+_CATEGORY_COLUMNS = [
+    'model',
+    'category_1',
+    'category_2',
+    'frame_material',
+    'city',
+    'state'
+]
+
+
+def _as_categories(df):
+    """Convert any of the _CATEGORY_COLUMNS found in df to categoricals."""
+    columns = [col for col in _CATEGORY_COLUMNS if col in df.columns]
+    return df.astype({col: "category" for col in columns})
+
+
+def _parse_dates(dates):
+    """
+
+    Convert order dates to datetimes, parsing each distinct value once with the stored format.
+
+    There are a few thousand distinct dates across all orderlines, so the parse runs on those only.
+    Values that do not match _DATE_FORMAT fall back to pandas format inference.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+
+    # Missing values get code -1, which take() fills with NaT
+    codes, uniques = pd.factorize(dates)
+    try:
+        parsed = pd.to_datetime(uniques, format=_DATE_FORMAT)
+    except (ValueError, TypeError):
+        parsed = pd.to_datetime(uniques)
+
+    return pd.Series(
+        pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=dates.index,
+        name=dates.name
     )
 
-    # 4 Return data frame
+
+def _join_and_clean(orderlines_df, bikes_df, bikeshops_df, columns=None):
+    """
+
+    Join bikes and bikeshops onto orderlines and build the output columns in one pass.
+
+    This gives the same rows as two left merges on the unique lookup keys,
+    but only the requested output columns are ever built, each one once.
+    """
+    if columns is None:
+        columns = _OUTPUT_COLUMNS
+
+    # Row of the matching bike and bikeshop for every orderline, -1 when there is none
+    # A key is only read when a column needs it, see _orderlines_sources()
+    bike_rows = shop_rows = None
+    if "product.id" in orderlines_df.columns:
+        bike_rows = pd.Index(bikes_df["bike.id"]).get_indexer(orderlines_df["product.id"])
+    if "customer.id" in orderlines_df.columns:
+        shop_rows = pd.Index(bikeshops_df["bikeshop.id"]).get_indexer(orderlines_df["customer.id"])
+
+    def lookup(df, col, rows):
+        # Missing matches become NaN, like a left join
+        return pd.api.extensions.take(df[col].array, rows, allow_fill=True)
+
+    # Build each column straight from the source arrays
+    data = {}
+    for col in columns:
+        if col == "order_date":
+            data[col] = _parse_dates(orderlines_df["order.date"]).array
+        elif col == "total_revenue":
+            data[col] = orderlines_df["quantity"].to_numpy() * lookup(bikes_df, "price", bike_rows)
+        elif col in _ORDERLINES_SOURCES:
+            data[col] = orderlines_df[_ORDERLINES_SOURCES[col]].array
+        elif col in bikes_df.columns:
+            data[col] = lookup(bikes_df, col, bike_rows)
+        else:
+            data[col] = lookup(bikeshops_df, _BIKESHOPS_SOURCES.get(col, col), shop_rows)
+
+    # copy=False: the arrays above are already new, no need to copy them again
+    return pd.DataFrame(data, columns=columns, copy=False)
+
+
+def _finish_pushdown(joined_df, columns, bikes_df=None, bikeshops_df=None):
+    """Parse dates and attach the lookup text columns to rows of the pushdown query."""
+    if "order_date" in joined_df.columns:
+        joined_df["order_date"] = _parse_dates(joined_df["order_date"])
+    if bikes_df is not None:
+        # total_revenue needs price even when price itself was not requested
+        bikes_columns = columns + ["price"] if "total_revenue" in columns else columns
+        joined_df = _attach_lookups(joined_df, bikes_df, "product.id", "bike.id", bikes_columns)
+        if "total_revenue" in columns:
+            joined_df["total_revenue"] = joined_df["quantity"].to_numpy() * joined_df["price"].to_numpy()
+    if bikeshops_df is not None:
+        joined_df = _attach_lookups(joined_df, bikeshops_df, "customer.id", "bikeshop.id", columns)
+    return joined_df[columns]
+
+
+def _attach_lookups(joined_df, lookup_df, key, lookup_key, columns):
+    """Add the requested columns of a prepared bikes or bikeshops table matching key, as a left join would."""
+    rows = pd.Index(lookup_df[lookup_key]).get_indexer(joined_df[key])
+    for col in _BIKES_LOOKUPS + _BIKESHOPS_LOOKUPS:
+        source = _BIKESHOPS_SOURCES.get(col, col)
+        if col in columns and source in lookup_df.columns:
+            # Categoricals stay categoricals, each row only stores a code
+            joined_df[col] = pd.api.extensions.take(
+                lookup_df[source].array, rows, allow_fill=True
+            )
     return joined_df
+
+
+# Orderlines columns, in table order
+_ORDERLINES_COLUMNS = [
+    'order.id',
+    'order.line',
+    'order.date',
+    'customer.id',
+    'product.id',
+    'quantity'
+]
+
+# Source column in orderlines and bikeshops for output columns that were renamed
+_ORDERLINES_SOURCES = {
+    'order_id': 'order.id',
+    'order_line': 'order.line',
+    'quantity': 'quantity'
+}
+_BIKESHOPS_SOURCES = {
+    'bikeshop_name': 'bikeshop.name'
+}
@@ -0,0 +1,162 @@
+# IMPORTS ----
+
+from pandas_extensions._lazy import np, pd
+from pandas_extensions._utils import as_list
+
+# Scaling ----
+
+
+def standardize(data, by, columns=None, ddof=1):
+    """
+
+    Converts columns to z-scores within each group.
+
+    Same values as groupby().apply(lambda x: (x - x.mean()) / x.std()),
+    but the group means and standard deviations come from transform(),
+    so no Python function runs per group.
+
+    Args:
+        data (DataFrame): The data to scale.
+        by (str or list): Column(s) defining the groups.
+        columns (str or list, optional): Column(s) to scale. Defaults to None, every numeric column not in by.
+        ddof (int, optional): Delta degrees of freedom for the standard deviation. Defaults to 1, like std().
+
+    Returns:
+        DataFrame: A copy of data, same index and row order, with the columns scaled.
+    """
+    grouped, columns = _group_columns(data, by, columns)
+
+    mean_df = grouped.transform("mean")
+    std_df = grouped.transform("std", ddof=ddof)
+
+    # Written into a copy, assign() only takes string labels
+    scaled_df = data.copy()
+    scaled_df[columns] = (data[columns] - mean_df) / std_df
+    return scaled_df
+
+
+def min_max_scale(data, by, columns=None):
+    """
+
+    Rescales columns to the 0 to 1 range within each group.
+
+    Same values as groupby().apply(lambda x: (x - x.min()) / (x.max() - x.min())),
+    using transform() for the group minimum and maximum.
+
+    Args:
+        data (DataFrame): The data to scale.
+        by (str or list): Column(s) defining the groups.
+        columns (str or list, optional): Column(s) to scale. Defaults to None, every numeric column not in by.
+
+    Returns:
+        DataFrame: A copy of data, same index and row order, with the columns scaled.
+    """
+    grouped, columns = _group_columns(data, by, columns)
+
+    min_df = grouped.transform("min")
+    max_df = grouped.transform("max")
+
+    scaled_df = data.copy()
+    scaled_df[columns] = (data[columns] - min_df) / (max_df - min_df)
+    return scaled_df
+
+
+# Slicing ----
+
+
+def group_slice(data, by, start=None, stop=None, step=None):
+    """
+
+    Selects the rows at positions start:stop:step within each group.
+
+    Same rows as groupby().apply(lambda x: x.iloc[start:stop:step]), including
+    negative positions counted from the end of each group. Each row's position in
+    its group comes from cumcount(), so one boolean mask selects every group at once.
+    Covers head (stop=n), tail (start=-n), nth windows (start=10, stop=16) and
+    every k-th row (step=k).
+
+    Args:
+        data (DataFrame): The data to slice.
+        by (str or list): Column(s) defining the groups.
+        start (int, optional): First position, negative counts from the end. Defaults to None, the first row.
+        stop (int, optional): Position to stop before, negative counts from the end. Defaults to None, the last row.
+        step (int, optional): Keep every step-th row from start, must be positive. Defaults to None, every row.
+
+    Returns:
+        DataFrame: The selected rows, in their original order with their original index.
+            Unlike apply(), no group level is added to the index.
+    """
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("`data` must be a pandas DataFrame.")
+    if step is None:
+        step = 1
+    if step < 1:
+        raise ValueError(f"step must be a positive integer, got {step!r}")
+
+    grouped = data.groupby(_as_keys(data, by), sort=False, observed=True)
+
+    # 1 Position of every row in its group, and the size of its group
+    position = grouped.cumcount().to_numpy()
+    size = position + grouped.cumcount(ascending=False).to_numpy() + 1
+
+    # 2 Resolve start and stop per row the way slice.indices() does
+    lo = _resolve_bound(start, size, default=0)
+    hi = _resolve_bound(stop, size, default=size)
+
+    # 3 One mask over every group
+    mask = (position >= lo) & (position < hi) & ((position - lo) % step == 0)
+
+    return data[mask]
+
+
+def every_kth(data, by, k, offset=0):
+    """
+
+    Selects every k-th row within each group, starting at position offset.
+
+    Same rows as groupby().apply(lambda x: x.iloc[offset::k]), see group_slice().
+
+    Args:
+        data (DataFrame): The data to slice.
+        by (str or list): Column(s) defining the groups.
+        k (int): Keep one row in k.
+        offset (int, optional): Position of the first row to keep. Defaults to 0.
+
+    Returns:
+        DataFrame: The selected rows, in their original order with their original index.
+    """
+    return group_slice(data, by, start=offset, step=k)
+
+
+# Helpers ----
+
+
+def _as_keys(data, by):
+    """Turn column names into the Series to group by, so they can group a subset of columns."""
+    return [data[col] for col in as_list(by)]
+
+
+def _group_columns(data, by, columns):
+    """Group the value columns of data by the by columns, returning the groupby and the column list."""
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("`data` must be a pandas DataFrame.")
+
+    by = as_list(by)
+    if columns is None:
+        columns = [
+            col for col in data.select_dtypes("number").columns if col not in by
+        ]
+    else:
+        columns = as_list(columns)
+
+    grouped = data[columns].groupby(_as_keys(data, by), sort=False, observed=True)
+    return grouped, columns
+
+
+def _resolve_bound(bound, size, default):
+    """Per-row start or stop position for a slice bound, clipped to each group's size."""
+    if bound is None:
+        return default
+    if bound < 0:
+        return np.maximum(size + bound, 0)
+    return np.minimum(bound, size)
@@ -0,0 +1,344 @@
+# IMPORTS ----
+
+from pandas_extensions._lazy import np, pd
+from pandas_extensions._utils import as_list
+
+# Default factor for each method
+# iqr: Tukey fences, zscore: 3 standard deviations, mad: modified z-score cut-off (Iglewicz and Hoaglin)
+_DEFAULT_FACTORS = {
+    "iqr": 1.5,
+    "zscore": 3,
+    "mad": 3.5
+}
+
+# Values fed to a QuantileSketch at a time when approx=True
+_SKETCH_CHUNKSIZE = 1_000_000
+
+# Detect outliers ----
+
+
+def detect_outliers(x, method="iqr", factor=None, approx=False, compression=100):
+    """
+
+    Flags outliers in a pandas Series.
+
+    Methods:
+        iqr: outside [Q1 - factor * IQR, Q3 + factor * IQR]
+        zscore: |x - mean| / std > factor
+        mad: 0.6745 * |x - median| / MAD > factor, MAD being the median absolute deviation
+
+    Args:
+        x (Series): Numeric values to check.
+        method (str, optional): "iqr", "zscore" or "mad". Defaults to "iqr".
+        factor (float, optional): How far out a value must be. Defaults to None, 1.5 for iqr, 3 for zscore and 3.5 for mad.
+        approx (bool, optional): If True, the quantiles for iqr and mad come from a QuantileSketch instead of a sort.
+            x is already in memory, so this does not lower memory use. For bounded memory, feed
+            QuantileSketch.update() from collect_data_chunks() instead. Defaults to False, exact quantiles.
+        compression (int, optional): Sketch size when approx=True, see QuantileSketch. Defaults to 100.
+
+    Returns:
+        Series: Boolean, same index as x, True for outliers. Missing values are never outliers.
+    """
+    # Checks
+    if not isinstance(x, pd.Series):
+        raise TypeError("`x` must be a pandas Series.")
+
+    codes = np.zeros(len(x), dtype=np.intp)
+    is_outlier = _outlier_mask(
+        x.to_numpy(dtype=float), codes, 1, method, factor, approx, compression
+    )
+
+    return pd.Series(is_outlier, index=x.index, name=x.name)
+
+
+def detect_outliers_grouped(
+    data,
+    value_column,
+    groups,
+    method="iqr",
+    factor=None,
+    approx=False,
+    compression=100
+):
+    """
+
+    Flags outliers within each group, e.g. per category_2 or per bikeshop_name.
+
+    Same flags as data.groupby(groups)[value_column].transform(detect_outliers), but the
+    statistics of every group come from one groupby().quantile() or np.bincount() pass,
+    not one quantile() call per group.
+
+    Args:
+        data (DataFrame): The data to check.
+        value_column (str): Numeric column to check.
+        groups (str or list): Column(s) defining the groups.
+        method (str, optional): "iqr", "zscore" or "mad", see detect_outliers(). Defaults to "iqr".
+        factor (float, optional): How far out a value must be. Defaults to None, see detect_outliers().
+        approx (bool, optional): If True, use a QuantileSketch for iqr and mad, see detect_outliers(). Memory use is still proportional to data. Defaults to False.
+        compression (int, optional): Sketch size per group when approx=True. Defaults to 100.
+
+    Returns:
+        Series: Boolean, same index as data, True for outliers.
+    """
+    # Checks
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("`data` must be a pandas DataFrame.")
+
+    grouped = data.groupby(as_list(groups), sort=False, observed=True, dropna=False)
+    codes = grouped.ngroup().to_numpy()
+    is_outlier = _outlier_mask(
+        data[value_column].to_numpy(dtype=float),
+        codes,
+        grouped.ngroups,
+        method,
+        factor,
+        approx,
+        compression
+    )
+
+    return pd.Series(is_outlier, index=data.index, name=value_column)
+
+
+# Quantile sketch ----
+
+
+class QuantileSketch:
+    """
+
+    Approximate quantiles from data seen in chunks, for one series or many groups.
+
+    A merging t-digest: each group keeps at most about compression centroids
+    (a mean and a weight), small near the tails and larger around the median,
+    so extreme quantiles stay accurate. update() merges a chunk with the
+    existing centroids in one vectorised pass over all groups, so memory depends
+    on the number of groups and compression, not on the rows seen.
+
+    Args:
+        compression (int, optional): Larger keeps more centroids and gives more accurate quantiles. Defaults to 100.
+
+    Example:
+        sketch = QuantileSketch()
+        for chunk in collect_data_chunks():
+            sketch.update(chunk["total_revenue"], groups=chunk["category_2"])
+        sketch.quantile([0.25, 0.75])
+    """
+
+    def __init__(self, compression=100):
+        if compression < 1:
+            raise ValueError(f"compression must be positive, got {compression!r}")
+        self.compression = compression
+
+        # Group labels, codes below index into it
+        self.groups = pd.Index([])
+        self._grouped = None
+        # Centroids, sorted by group code then mean
+        self._means = np.zeros(0)
+        self._weights = np.zeros(0)
+        self._codes = np.zeros(0, dtype=np.intp)
+        # Exact minimum and maximum per group, the ends of the interpolation
+        self._min = np.zeros(0)
+        self._max = np.zeros(0)
+
+    def update(self, values, groups=None):
+        """
+
+        Adds a chunk of values.
+
+        Args:
+            values (array-like): Numeric values, missing values are skipped.
+            groups (array-like, optional): Group label of each value. Defaults to None, one series.
+                Use the same choice for every update.
+
+        Returns:
+            QuantileSketch: The sketch itself.
+        """
+        grouped = groups is not None
+        if self._grouped is None:
+            self._grouped = grouped
+        elif self._grouped != grouped:
+            raise ValueError("groups must be given on every update or on none")
+
+        values = np.asarray(values, dtype=float)
+        if grouped:
+            codes = self._group_codes(groups)
+        else:
+            if len(self.groups) == 0:
+                self._add_groups(pd.Index([None]))
+            codes = np.zeros(len(values), dtype=np.intp)
+
+        valid = ~np.isnan(values)
+        self._update_codes(values[valid], codes[valid], np.ones(valid.sum()))
+        return self
+
+    def quantile(self, q):
+        """
+
+        Estimates quantiles from the centroids.
+
+        Args:
+            q (float or list): Quantile(s) between 0 and 1.
+
+        Returns:
+            float, Series or DataFrame: For one series, a float (one q) or a Series indexed by q.
+                With groups, a Series indexed by group (one q) or a DataFrame with a column per q.
+        """
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if ((qs < 0) | (qs > 1)).any():
+            raise ValueError(f"q must be between 0 and 1, got {q!r}")
+
+        result = self._quantiles(qs)
+
+        if not self._grouped:
+            result = result[0] if len(result) else np.full(len(qs), np.nan)
+            return float(result[0]) if np.ndim(q) == 0 else pd.Series(result, index=qs)
+        if np.ndim(q) == 0:
+            return pd.Series(result[:, 0], index=self.groups)
+        return pd.DataFrame(result, index=self.groups, columns=qs)
+
+    def _group_codes(self, groups):
+        """Codes of the group labels, adding labels not seen before."""
+        groups = pd.Index(groups)
+        new = groups.unique().difference(self.groups, sort=False)
+        if len(new):
+            self._add_groups(new)
+        return self.groups.get_indexer(groups)
+
+    def _add_groups(self, labels):
+        """Extend the per-group state for new group labels."""
+        # The first labels are kept as given, so their dtype carries over
+        self.groups = labels if len(self.groups) == 0 else self.groups.append(labels)
+        self._min = np.r_[self._min, np.full(len(labels), np.inf)]
+        self._max = np.r_[self._max, np.full(len(labels), -np.inf)]
+
+    def _update_codes(self, values, codes, weights):
+        """Merge values with the existing centroids and compress, for group codes already known."""
+        if len(values) == 0:
+            return
+        n_groups = len(self.groups)
+        np.minimum.at(self._min, codes, values)
+        np.maximum.at(self._max, codes, values)
+
+        # 1 Existing centroids and the new values together, sorted by group then value
+        means = np.r_[self._means, values]
+        weights = np.r_[self._weights, weights]
+        codes = np.r_[self._codes, codes]
+        order = np.argsort(means, kind="stable")
+        order = order[np.argsort(codes[order], kind="stable")]
+        means, weights, codes = means[order], weights[order], codes[order]
+
+        # 2 Quantile at the middle of each centroid within its group
+        totals = np.bincount(codes, weights=weights, minlength=n_groups)
+        cum_weights = np.cumsum(weights)
+        group_start = np.r_[0, np.cumsum(totals)[:-1]]
+        q_mid = (cum_weights - weights / 2 - group_start[codes]) / totals[codes]
+
+        # 3 Bin with the t-digest scale function, narrow bins near q = 0 and q = 1
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1))
+        new_bin = np.r_[True, (codes[1:] != codes[:-1]) | (k[1:] != k[:-1])]
+        starts = np.flatnonzero(new_bin)
+
+        # 4 One centroid per bin, at the weighted mean
+        bin_weights = np.add.reduceat(weights, starts)
+        self._means = np.add.reduceat(means * weights, starts) / bin_weights
+        self._weights = bin_weights
+        self._codes = codes[starts]
+
+    def _quantiles(self, qs):
+        """Quantiles of every group, groups x qs, NaN for groups with no values."""
+        n_groups = len(self.groups)
+        result = np.full((n_groups, len(qs)), np.nan)
+        if len(self._means) == 0:
+            return result
+
+        # Each group is laid out on [2 * code, 2 * code + 1]: its minimum, centroid midpoints, its maximum
+        # The gaps keep groups apart, so one np.interp() covers every group
+        totals = np.bincount(self._codes, weights=self._weights, minlength=n_groups)
+        cum_weights = np.cumsum(self._weights)
+        group_start = np.r_[0, np.cumsum(totals)[:-1]]
+        q_mid = (cum_weights - self._weights / 2 - group_start[self._codes]) / totals[self._codes]
+
+        has_values = totals > 0
+        seen = np.flatnonzero(has_values)
+        x_points = np.r_[2 * seen, 2 * self._codes + q_mid, 2 * seen + 1]
+        y_points = np.r_[self._min[seen], self._means, self._max[seen]]
+        order = np.argsort(x_points, kind="stable")
+
+        targets = 2 * seen[:, None] + qs[None, :]
+        result[seen] = np.interp(targets, x_points[order], y_points[order])
+        return result
+
+
+# Helpers ----
+
+
+def _outlier_mask(values, codes, n_groups, method, factor, approx, compression):
+    """Boolean outlier flags for values, with statistics per group code."""
+    if method not in _DEFAULT_FACTORS:
+        raise ValueError(
+            f"method must be one of {list(_DEFAULT_FACTORS)}, got {method!r}"
+        )
+    if factor is None:
+        factor = _DEFAULT_FACTORS[method]
+
+    def quantiles(vals, qs):
+        if approx:
+            return _sketch_quantiles(vals, codes, n_groups, qs, compression)
+        return _group_quantiles(vals, codes, n_groups, qs)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "iqr":
+            q1, q3 = quantiles(values, [0.25, 0.75]).T
+            iqr = q3 - q1
+            lower = (q1 - factor * iqr)[codes]
+            upper = (q3 + factor * iqr)[codes]
+            return (values < lower) | (values > upper)
+
+        if method == "zscore":
+            mean, std = _group_mean_std(values, codes, n_groups)
+            return np.abs(values - mean[codes]) / std[codes] > factor
+
+        # mad: median, then the median of the absolute deviations from it
+        median = quantiles(values, [0.5])[:, 0]
+        deviation = np.abs(values - median[codes])
+        mad = quantiles(deviation, [0.5])[:, 0]
+        return 0.6745 * deviation / mad[codes] > factor
+
+
+def _group_quantiles(values, codes, n_groups, qs):
+    """Exact quantiles per group code, groups x qs, with linear interpolation like quantile()."""
+    if n_groups == 1:
+        return np.nanquantile(values, qs)[None, :]
+
+    # groupby().quantile() handles every group in one Cython pass
+    return (
+        pd.Series(values)
+        .groupby(codes)
+        .quantile(qs)
+        .unstack()
+        .reindex(index=range(n_groups), columns=qs)
+        .to_numpy()
+    )
+
+
+def _sketch_quantiles(values, codes, n_groups, qs, compression):
+    """Approximate quantiles per group code from a QuantileSketch fed in chunks."""
+    sketch = QuantileSketch(compression)
+    sketch._add_groups(pd.RangeIndex(n_groups))
+    sketch._grouped = True
+    for start in range(0, len(values), _SKETCH_CHUNKSIZE):
+        chunk = values[start:start + _SKETCH_CHUNKSIZE]
+        chunk_codes = codes[start:start + _SKETCH_CHUNKSIZE]
+        valid = ~np.isnan(chunk)
+        sketch._update_codes(chunk[valid], chunk_codes[valid], np.ones(valid.sum()))
+    return sketch._quantiles(np.asarray(qs, dtype=float))
+
+
+def _group_mean_std(values, codes, n_groups):
+    """Mean and sample standard deviation per group code, skipping missing values."""
+    valid = ~np.isnan(values)
+    counts = np.bincount(codes[valid], minlength=n_groups)
+    mean = np.bincount(codes[valid], weights=values[valid], minlength=n_groups) / counts
+    squares = np.bincount(
+        codes[valid], weights=(values[valid] - mean[codes[valid]]) ** 2, minlength=n_groups
+    )
+    return mean, np.sqrt(squares / (counts - 1))
@@ -0,0 +1,414 @@
+# IMPORTS ----
+
+from pandas_extensions._lazy import np, pd
+from pandas_extensions._utils import as_list
+
+# Summarize by time ----
+
+
+def summarize_by_time(
+    data,
+    date_column,
+    value_column,
+    groups=None,
+    rule="D",
+    agg_func="sum",
+    kind="period",
+    wide=True,
+    fillna=0
+):
+    """
+
+    Aggregates values by time period and, optionally, by groups.
+
+    Same result as set_index() -> groupby() -> resample() -> agg() -> unstack(),
+    but done as one groupby on the period of each date plus the group columns.
+    This stays fast with many groups, where groupby().resample() gets slow.
+
+    Args:
+        data (DataFrame): The data to summarize.
+        date_column (str): Name of the datetime column.
+        value_column (str or list): Column(s) to aggregate.
+        groups (str or list, optional): Column(s) to group by as well as time. Defaults to None.
+        rule (str, optional): Period frequency, e.g. "D", "W", "M", "Q" or "Y". Defaults to "D".
+        agg_func (str, callable or list, optional): Aggregation passed to agg(), e.g. "sum" or "mean". Defaults to "sum".
+        kind (str, optional): "period" keeps a PeriodIndex, "timestamp" converts it to the start of each period. Defaults to "period".
+        wide (bool, optional): If True, pivot the groups into columns. If False, return long format. Defaults to True.
+        fillna (optional): In wide format, value for periods or groups with no rows, like resample() gives 0 for empty sums. Use None to keep NaN. Defaults to 0.
+
+    Returns:
+        DataFrame: Wide format is indexed by every period from the first to the last date.
+            Long format has one row per period and group that has data.
+    """
+    # Checks
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("`data` must be a pandas DataFrame.")
+    if kind not in ("period", "timestamp"):
+        raise ValueError(f'kind must be "period" or "timestamp", got {kind!r}')
+
+    if groups is None:
+        groups = []
+    elif isinstance(groups, str):
+        groups = [groups]
+    else:
+        groups = list(groups)
+
+    # 1 Period of every row, stored as integer ordinals so grouping is cheap
+    periods = data[date_column].dt.to_period(rule).rename(date_column)
+
+    # 2 One groupby over period and groups together
+    # observed=True skips category combinations that never occur
+    summary_df = (
+        data[groups + as_list(value_column)]
+        .groupby([periods] + [data[col] for col in groups], observed=True, sort=True)
+        .agg(agg_func)
+    )
+
+    # 3 Wide format: groups become columns and every period in the range gets a row
+    if wide:
+        if groups:
+            summary_df = summary_df.unstack(groups)
+        # No dates at all, e.g. an empty date range, leaves no range to fill
+        if periods.notna().any():
+            full_range = pd.period_range(
+                start=periods.min(),
+                end=periods.max(),
+                freq=periods.dt.freq
+            )
+            summary_df = summary_df.reindex(full_range)
+            summary_df.index.name = date_column
+
+        if fillna is not None:
+            summary_df = summary_df.fillna(fillna)
+
+    # A single value column in wide format does not need its own column level
+    if wide and groups and isinstance(value_column, str):
+        summary_df.columns = summary_df.columns.droplevel(0)
+
+    # 4 Period or timestamp index
+    if kind == "timestamp":
+        if isinstance(summary_df.index, pd.MultiIndex):
+            summary_df.index = summary_df.index.set_levels(
+                summary_df.index.levels[0].to_timestamp(), level=0
+            )
+        else:
+            summary_df.index = summary_df.index.to_timestamp()
+
+    if not wide:
+        summary_df = summary_df.reset_index()
+
+    return summary_df
+
+
+# Measure change ----
+
+# Changes computed against the value lags rows earlier
+_LAG_METHODS = ("diff", "pct_change", "log_return")
+
+# Changes computed against the first value of each series
+_BASELINE_METHODS = ("diff_baseline", "pct_baseline")
+
+
+def measure_change(
+    data,
+    value_column=None,
+    method="diff",
+    lags=1,
+    groups=None,
+    date_column=None
+):
+    """
+
+    Measures period-over-period change for many series at once.
+
+    Wide data has one column per series, like bike_sales_cat2_m_wide_df.
+    Long data has one row per date and group, give the group columns in groups.
+    Either way the changes come from shifted NumPy arrays over all series together,
+    in place of apply() or groupby().transform() with a lambda per series.
+
+    Methods:
+        diff: x - x.shift(lag)
+        pct_change: (x - x.shift(lag)) / x.shift(lag)
+        log_return: log(x / x.shift(lag))
+        diff_baseline: x - first value of the series
+        pct_baseline: (x - first value) / first value
+
+    The first value of a series is its first non-missing value, so series that start later
+    are measured from their own start.
+
+    Args:
+        data (DataFrame): The data, in time order unless date_column is given.
+        value_column (str or list, optional): Column(s) to measure. Defaults to None, every numeric column not in groups or date_column.
+        method (str or list, optional): One or more of the methods above. Defaults to "diff".
+        lags (int or list, optional): One or more lags for the lag methods, in rows. Defaults to 1.
+        groups (str or list, optional): Column(s) identifying each series in long data. Defaults to None, wide data.
+        date_column (str, optional): Column to order the rows by within each series. Defaults to None, the current row order.
+
+    Returns:
+        DataFrame: Same index as data. With one method and lag, the columns are the value columns.
+            Otherwise the columns have two levels, e.g. ("pct_change_12", "total_revenue").
+    """
+    # Checks
+    if not isinstance(data, pd.DataFrame):
+        raise TypeError("`data` must be a pandas DataFrame.")
+
+    methods = as_list(method)
+    for m in methods:
+        if m not in _LAG_METHODS + _BASELINE_METHODS:
+            raise ValueError(
+                f"method must be one of {list(_LAG_METHODS + _BASELINE_METHODS)}, got {m!r}"
+            )
+    lags = [lags] if np.ndim(lags) == 0 else list(lags)
+    for lag in lags:
+        if not isinstance(lag, (int, np.integer)) or lag < 1:
+            raise ValueError(f"lags must be positive integers, got {lag!r}")
+
+    groups = [] if groups is None else as_list(groups)
+    if value_column is None:
+        value_column = [
+            col for col in data.select_dtypes("number").columns
+            if col not in groups and col != date_column
+        ]
+    value_column = as_list(value_column)
+
+    # 1 Sort so each series is a contiguous block in time order
+    n_rows = len(data)
+    if groups:
+        codes = data.groupby(groups, sort=False, observed=True, dropna=False) \
+            .ngroup().to_numpy()
+    else:
+        codes = np.zeros(n_rows, dtype=np.intp)
+    if date_column is not None:
+        dates = pd.factorize(data[date_column], sort=True)[0]
+        order = np.lexsort((dates, codes))
+    else:
+        order = np.argsort(codes, kind="stable")
+
+    codes = codes[order]
+    value_df = data[value_column]
+    values = value_df.to_numpy(dtype=float)[order]
+
+    # 2 Every change as a 2D array, rows x value columns
+    changes = {}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for m in methods:
+            if m in _BASELINE_METHODS:
+                base = _first_valid(values, codes)
+                changes[m] = _change(values, base, m)
+            else:
+                for lag in lags:
+                    changes[f"{m}_{lag}"] = _change(
+                        values, _shift(values, codes, lag), m
+                    )
+
+    # 3 Back to the original row order
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(n_rows)
+
+    if len(changes) == 1:
+        (result,) = changes.values()
+        return pd.DataFrame(result[inverse], index=data.index, columns=value_df.columns)
+
+    columns = pd.MultiIndex.from_product([list(changes), value_df.columns])
+    result = np.concatenate([arr[inverse] for arr in changes.values()], axis=1)
+    return pd.DataFrame(result, index=data.index, columns=columns)
+
+
+# Incremental aggregates ----
+
+# Statistics kept by IncrementalAggregator
+_INCREMENTAL_STATS = ("sum", "mean", "count")
+
+
+class IncrementalAggregator:
+    """
+
+    Expanding and rolling sums, means and counts that update from newly appended periods only.
+
+    Same values as data.expanding().agg(stat) and data.rolling(window, min_periods).agg(stat)
+    over the full history, but each update() only reads the new rows. The running totals
+    per series and the last window - 1 rows are kept between updates, so a refresh costs
+    O(new rows) instead of O(history). Pickle the aggregator (e.g. pd.to_pickle()) to carry
+    the state from one job run to the next.
+
+    Args:
+        window (int, optional): Rolling window length in rows. Defaults to None, expanding aggregates only.
+        min_periods (int, optional): Minimum non-missing values in a rolling window, like rolling(). Defaults to None, the full window.
+        stats (str or list, optional): Any of "sum", "mean" and "count". Defaults to "sum".
+
+    Example:
+        agg = IncrementalAggregator(window=12, stats=["sum", "mean"])
+        agg.update(history_wide_df)
+        agg.update(new_month_wide_df)
+    """
+
+    def __init__(self, window=None, min_periods=None, stats="sum"):
+        stats = as_list(stats)
+        for stat in stats:
+            if stat not in _INCREMENTAL_STATS:
+                raise ValueError(
+                    f"stats must be one of {list(_INCREMENTAL_STATS)}, got {stat!r}"
+                )
+        if window is not None and window < 1:
+            raise ValueError(f"window must be a positive integer, got {window!r}")
+        if min_periods is None:
+            min_periods = window
+        elif window is not None and not 0 < min_periods <= window:
+            raise ValueError(
+                f"min_periods must be between 1 and window, got {min_periods!r}"
+            )
+
+        self.window = window
+        self.min_periods = min_periods
+        self.stats = stats
+
+        # Running state, one entry per series
+        self.series = pd.Index([])
+        self.last_period = None
+        self._sum = np.zeros(0)
+        self._count = np.zeros(0)
+        # Last window - 1 rows, rows x series
+        self._buffer = np.zeros((0, 0))
+
+    def update(self, data):
+        """
+
+        Adds new periods and returns their aggregates.
+
+        Args:
+            data (DataFrame): New rows only, indexed by period and after every period seen so far, one numeric column per series.
+                Series seen before but missing here count as missing values, new series start from nothing.
+
+        Returns:
+            DataFrame: Same index as data, one column per series. With one aggregate, the columns are the series.
+                Otherwise the columns have two levels, e.g. ("rolling_mean", "Elite Road").
+        """
+        # Checks
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError("`data` must be a pandas DataFrame.")
+        if len(data) and not data.index.is_monotonic_increasing:
+            raise ValueError("data must be sorted by its index")
+        if len(data) and self.last_period is not None and data.index[0] <= self.last_period:
+            raise ValueError(
+                f"data must start after the last period seen, {self.last_period!r}, got {data.index[0]!r}"
+            )
+
+        # 1 Line up the state with the known and new series
+        self._add_series(data.columns)
+        values = data.reindex(columns=self.series).to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0)
+
+        results = {}
+
+        # 2 Expanding: running totals plus the cumulative sums of the new rows
+        run_sum = self._sum + np.cumsum(filled, axis=0)
+        run_count = self._count + np.cumsum(valid, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._add_results(results, "expanding", run_sum, run_count, 1, min_periods=1)
+
+        # 3 Rolling: the buffered rows plus the new rows, window sums from differences of cumulative sums
+        if self.window is not None:
+            n_buffer = len(self._buffer)
+            extended = np.vstack([self._buffer, values])
+            ext_valid = ~np.isnan(extended)
+            ext_sum = _cumsum0(np.where(ext_valid, extended, 0))
+            ext_count = _cumsum0(ext_valid)
+            # Window ending at each new row, shorter at the start of the history
+            stop = np.arange(n_buffer + 1, n_buffer + len(values) + 1)
+            start = np.maximum(stop - self.window, 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._add_results(
+                    results,
+                    "rolling",
+                    ext_sum[stop] - ext_sum[start],
+                    ext_count[stop] - ext_count[start],
+                    (stop - start)[:, None],
+                    min_periods=self.min_periods
+                )
+            self._buffer = extended[max(len(extended) - (self.window - 1), 0):]
+
+        # 4 Keep the state for the next update
+        if len(data):
+            self._sum = run_sum[-1]
+            self._count = run_count[-1]
+            self.last_period = data.index[-1]
+
+        if len(results) == 1:
+            (result,) = results.values()
+            return pd.DataFrame(result, index=data.index, columns=self.series)
+
+        columns = pd.MultiIndex.from_product([list(results), self.series])
+        return pd.DataFrame(
+            np.concatenate(list(results.values()), axis=1),
+            index=data.index,
+            columns=columns
+        )
+
+    def _add_series(self, columns):
+        """Extend the state with series not seen before, starting from nothing."""
+        new = columns.difference(self.series, sort=False)
+        if len(new) == 0:
+            return
+        # The first columns are kept as given, so their dtype and name carry over
+        self.series = columns if len(self.series) == 0 else self.series.append(new)
+        self._sum = np.r_[self._sum, np.zeros(len(new))]
+        self._count = np.r_[self._count, np.zeros(len(new))]
+        self._buffer = np.hstack([
+            self._buffer,
+            np.full((len(self._buffer), len(new)), np.nan)
+        ])
+
+    def _add_results(self, results, kind, total, count, rows, min_periods):
+        """Turn sums and counts into the requested statistics, sums and means are NaN below min_periods."""
+        enough = count >= min_periods
+        for stat in self.stats:
+            if stat == "sum":
+                value = np.where(enough, total, np.nan)
+            elif stat == "mean":
+                value = np.where(enough, total / count, np.nan)
+            else:
+                # Like pandas, counts only need min_periods rows, missing or not
+                value = np.where(rows >= min_periods, count, np.nan)
+            results[f"{kind}_{stat}"] = value
+
+
+# Helpers ----
+
+
+def _shift(values, codes, lag):
+    """Values lag rows earlier within the same series, NaN where that crosses a series start."""
+    shifted = np.full_like(values, np.nan)
+    if lag < len(values):
+        shifted[lag:] = values[:-lag]
+        shifted[lag:][codes[lag:] != codes[:-lag]] = np.nan
+    return shifted
+
+
+def _first_valid(values, codes):
+    """First non-missing value of each series, repeated on every row of that series."""
+    n_rows = len(values)
+    if n_rows == 0:
+        return values
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    # Row number of each valid value, n_rows where missing, so the minimum is the first valid row
+    rows = np.where(np.isnan(values), n_rows, np.arange(n_rows)[:, None])
+    first = np.minimum.reduceat(rows, starts, axis=0)
+    base = values[np.minimum(first, n_rows - 1), np.arange(values.shape[1])]
+    base[first == n_rows] = np.nan
+    # Series number of every row, to spread each series' base down its rows
+    return base[np.cumsum(np.r_[True, codes[1:] != codes[:-1]]) - 1]
+
+
+def _change(values, reference, method):
+    """Change of values relative to reference for one method."""
+    if method in ("diff", "diff_baseline"):
+        return values - reference
+    if method in ("pct_change", "pct_baseline"):
+        return (values - reference) / reference
+    return np.log(values / reference)
+
+
+def _cumsum0(values):
+    """Cumulative sum down the rows with a leading row of zeros."""
+    return np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
@@ -0,0 +1,70 @@
+import pandas as pd
+
+import pandas_extensions.accessors  # noqa: F401, registers the bikes accessor
+from pandas_extensions import outliers, timeseries
+
+
+def make_frame():
+    return pd.DataFrame({
+        "v": [1.0, 2.0, 4.0, 8.0, 16.0],
+        "w": [5.0, 5.0, 5.0, 5.0, 500.0],
+        "g": ["a", "a", "b", "b", "b"]
+    })
+
+
+def test_in_place_loc_edit_invalidates_result():
+    df = make_frame()
+    before = df.bikes.measure_change("v", method="pct_change")
+
+    df.loc[:, "v"] = [1.0, 3.0, 9.0, 27.0, 81.0]
+    after = df.bikes.measure_change("v", method="pct_change")
+
+    pd.testing.assert_frame_equal(after, timeseries.measure_change(df, "v", method="pct_change"))
+    assert not after.equals(before)
+
+
+def test_single_value_edit_invalidates_result():
+    df = make_frame()
+    df.bikes.detect_outliers("w", groups="g")
+
+    df.loc[4, "w"] = 5.0
+
+    pd.testing.assert_series_equal(
+        df.bikes.detect_outliers("w", groups="g"),
+        outliers.detect_outliers_grouped(df, "w", "g")
+    )
+
+
+def test_edit_of_unused_column_keeps_result():
+    df = make_frame()
+    before = df.bikes.measure_change("v")
+
+    df.loc[0, "w"] = 0.0
+
+    pd.testing.assert_frame_equal(df.bikes.measure_change("v"), before)
+
+
+def test_measure_change_of_every_column_sees_any_edit():
+    df = make_frame()
+    df.bikes.measure_change()
+
+    df.loc[2, "w"] = 50.0
+
+    pd.testing.assert_frame_equal(df.bikes.measure_change(), timeseries.measure_change(df))
+
+
+def test_series_iloc_edit_invalidates_result():
+    s = pd.Series([1.0, 2.0, 3.0, 2.0, 100.0])
+    assert s.bikes.detect_outliers().iloc[4]
+
+    s.iloc[4] = 2.5
+
+    pd.testing.assert_series_equal(s.bikes.detect_outliers(), outliers.detect_outliers(s))
+
+
+def test_edited_result_does_not_change_the_cache():
+    df = make_frame()
+    result = df.bikes.measure_change("v")
+    result.loc[:, "v"] = 0.0
+
+    pd.testing.assert_frame_equal(df.bikes.measure_change("v"), timeseries.measure_change(df, "v"))
@@ -0,0 +1,63 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from pandas_extensions.database import (
+    _join_and_clean,
+    _prepare_bikes,
+    _prepare_bikeshops
+)
+
+N_ORDERLINES = 200_000
+N_BIKES = 100
+N_BIKESHOPS = 30
+
+
+def make_tables(seed=0):
+    """Synthetic bikes, bikeshops and orderlines tables laid out like the database ones."""
+    rng = np.random.default_rng(seed)
+
+    bikes_df = pd.DataFrame({
+        "bike.id": np.arange(1, N_BIKES + 1),
+        "model": [f"Model {i}" for i in range(N_BIKES)],
+        "description": [
+            f"Category {i % 2} - Sub {i % 9} - {'Carbon' if i % 3 else 'Aluminum'}"
+            for i in range(N_BIKES)
+        ],
+        "price": rng.integers(400, 13000, N_BIKES)
+    })
+    bikeshops_df = pd.DataFrame({
+        "bikeshop.id": np.arange(1, N_BIKESHOPS + 1),
+        "bikeshop.name": [f"Bikeshop {i}" for i in range(N_BIKESHOPS)],
+        "location": [f"City {i}, S{i % 20}" for i in range(N_BIKESHOPS)]
+    })
+
+    dates = pd.date_range("2011-01-01", "2015-12-31", freq="D").strftime("%Y-%m-%d %H:%M:%S.%f")
+    orderlines_df = pd.DataFrame({
+        "order.id": np.arange(N_ORDERLINES) // 3 + 1,
+        "order.line": np.arange(N_ORDERLINES) % 3 + 1,
+        "order.date": np.sort(rng.choice(np.asarray(dates, dtype=object), N_ORDERLINES)),
+        "customer.id": rng.integers(1, N_BIKESHOPS + 1, N_ORDERLINES),
+        "product.id": rng.integers(1, N_BIKES + 1, N_ORDERLINES),
+        "quantity": rng.integers(1, 10, N_ORDERLINES)
+    })
+
+    return orderlines_df, _prepare_bikes(bikes_df), _prepare_bikeshops(bikeshops_df)
+
+
+def test_join_and_clean_peak_memory_stays_below_twice_the_output():
+    orderlines_df, bikes_df, bikeshops_df = make_tables()
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        joined_df = _join_and_clean(orderlines_df, bikes_df, bikeshops_df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    output_size = joined_df.memory_usage(deep=True, index=False).sum()
+    assert len(joined_df) == N_ORDERLINES
+    assert peak - baseline < 2 * output_size
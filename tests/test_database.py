@@ -0,0 +1,147 @@
+import asyncio
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from pandas_extensions import database
+
+ORDERLINES = [
+    # order.id, order.line, order.date, customer.id, product.id, quantity
+    (1, 1, "2011-01-07 00:00:00.000000", 1, 1, 1),
+    (1, 2, "2011-01-07 00:00:00.000000", 1, 2, 2),
+    (2, 1, "2011-02-10 00:00:00.000000", 2, 3, 1),
+    (3, 1, "2012-03-15 00:00:00.000000", 2, 1, 3),
+    # Unknown product and bikeshop, kept like a left join would
+    (4, 1, "2012-05-01 00:00:00.000000", 9, 9, 1)
+]
+
+
+@pytest.fixture
+def conn_string(tmp_path):
+    """A small bike orders database laid out like 00_database/bike_orders_database.sqlite."""
+    path = tmp_path / "bike_orders.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE bikes ("index" INTEGER, "bike.id" INTEGER, model TEXT, description TEXT, price INTEGER)')
+        conn.execute('CREATE TABLE bikeshops ("index" INTEGER, "bikeshop.id" INTEGER, "bikeshop.name" TEXT, location TEXT)')
+        conn.execute('CREATE TABLE orderlines ("index" INTEGER, "order.id" INTEGER, "order.line" INTEGER, "order.date" TEXT, "customer.id" INTEGER, "product.id" INTEGER, quantity INTEGER)')
+        conn.executemany("INSERT INTO bikes VALUES (?, ?, ?, ?, ?)", [
+            (0, 1, "Supersix Evo", "Road - Elite Road - Carbon", 12790),
+            (1, 2, "Trigger", "Mountain - Trail - Aluminum", 3200),
+            (2, 3, "Synapse", "Road - Endurance Road - Carbon", 2660)
+        ])
+        conn.executemany("INSERT INTO bikeshops VALUES (?, ?, ?, ?)", [
+            (0, 1, "Pittsburgh Mountain Machines", "Pittsburgh, PA"),
+            (1, 2, "Ithaca Mountain Climbers", "Ithaca, NY")
+        ])
+        conn.executemany(
+            "INSERT INTO orderlines VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(i,) + row for i, row in enumerate(ORDERLINES)]
+        )
+    yield database.sqlite_url(path)
+    database.dispose_engines()
+
+
+@pytest.mark.parametrize("columns", [
+    None,
+    ["order_date", "total_revenue"],
+    ["total_revenue"],
+    ["city", "model"],
+    ["state", "order_id"]
+])
+def test_pushdown_matches_default_path(conn_string, columns):
+    for dates in [{}, {"start": "2011-02-01", "end": "2012-04-01"}, {"start": "2030-01-01"}]:
+        pushdown_df = database.collect_data(conn_string, pushdown=True, columns=columns, **dates)
+        default_df = database.collect_data(conn_string, columns=columns, **dates)
+
+        pd.testing.assert_frame_equal(pushdown_df, default_df)
+        assert list(default_df.columns) == (columns or database._OUTPUT_COLUMNS)
+
+
+def test_collect_data_left_joins_lookups(conn_string):
+    data_df = database.collect_data(conn_string)
+
+    assert len(data_df) == len(ORDERLINES)
+    assert data_df["total_revenue"].tolist()[:4] == [12790, 6400, 2660, 38370]
+    assert data_df.iloc[4][["price", "model", "city"]].isna().all()
+
+
+@pytest.mark.parametrize("pushdown", [False, True])
+def test_collect_data_rejects_empty_columns(conn_string, pushdown):
+    with pytest.raises(ValueError, match="at least one column"):
+        database.collect_data(conn_string, pushdown=pushdown, columns=[])
+
+
+@pytest.mark.parametrize("columns, sources", [
+    (["city"], ["customer.id"]),
+    (["total_revenue"], ["product.id", "quantity"]),
+    (["order_date", "order_id", "model"], ["order.id", "order.date", "product.id"]),
+    (None, ["order.id", "order.line", "order.date", "customer.id", "product.id", "quantity"])
+])
+def test_orderlines_query_reads_only_needed_columns(columns, sources):
+    columns = database._check_columns(columns)
+
+    assert database._orderlines_sources(columns) == sources
+    assert database._orderlines_query(columns) == (
+        "SELECT " + ", ".join(f'"{col}"' for col in sources) + " FROM orderlines "
+    )
+
+
+@pytest.mark.parametrize("columns", [None, ["total_revenue"], ["city", "model"]])
+def test_projected_paths_match(conn_string, columns):
+    async def collect_async():
+        try:
+            return await database.collect_data_async(conn_string, columns=columns)
+        finally:
+            await database.dispose_async_engines()
+
+    default_df = database.collect_data(conn_string, columns=columns)
+    async_df = asyncio.run(collect_async())
+
+    pd.testing.assert_frame_equal(async_df, default_df)
+
+
+def test_write_table_on_a_used_connection(conn_string):
+    bikes_df = pd.read_sql("SELECT * FROM bikes", database.get_engine(conn_string))
+
+    with database.get_engine(conn_string).connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+        # The SELECT began a transaction, the DROP and CREATE must not join it silently
+        with pytest.raises(ValueError, match="transaction open"):
+            database.write_table(bikes_df, "bikes", conn)
+
+        conn.rollback()
+        assert database.write_table(bikes_df, "bikes", conn) == len(bikes_df)
+
+
+def test_incremental_after_an_empty_first_run(conn_string, tmp_path):
+    cache_path = tmp_path / "orderlines.pkl"
+    engine = database.get_engine(conn_string)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE orderlines_backup AS SELECT * FROM orderlines")
+        conn.exec_driver_sql("DELETE FROM orderlines")
+
+    assert database.collect_data_incremental(cache_path, conn_string).empty
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO orderlines SELECT * FROM orderlines_backup")
+    data_df = database.collect_data_incremental(cache_path, conn_string)
+
+    pd.testing.assert_frame_equal(data_df, database.collect_data(conn_string))
+    pd.testing.assert_frame_equal(pd.read_pickle(cache_path), data_df)
+
+
+@pytest.mark.parametrize("options", [{}, {"pushdown": True}, {"n_jobs": 2}])
+def test_collect_data_rejects_unknown_backend(conn_string, options):
+    with pytest.raises(ValueError, match="backend must be"):
+        database.collect_data(conn_string, backend="bogus", **options)
+
+
+def test_partitions_match_default_path(conn_string):
+    # The first rowid range has no orders from 2012 on, its partition comes back empty
+    dates = {"start": "2012-01-01"}
+
+    pd.testing.assert_frame_equal(
+        database.collect_data(conn_string, n_jobs=2, **dates),
+        database.collect_data(conn_string, **dates)
+    )
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_extensions import groupwise
+
+
+def make_frame(labels=("x", "y"), seed=0):
+    """Two value columns with the given labels and two group columns, with uneven group sizes."""
+    rng = np.random.default_rng(seed)
+    n = 60
+    return pd.DataFrame({
+        labels[0]: rng.normal(size=n),
+        labels[1]: rng.integers(0, 100, n).astype(float),
+        "g": rng.choice(["a", "b", "c"], n, p=[0.6, 0.3, 0.1]),
+        "h": rng.choice([1, 2], n)
+    })
+
+
+@pytest.mark.parametrize("labels", [("x", "y"), (2011, 2012)])
+def test_standardize_matches_apply(labels):
+    df = make_frame(labels)
+    columns = list(labels)
+
+    result = groupwise.standardize(df, ["g", "h"], columns)
+    expected = df.groupby(["g", "h"])[columns].apply(lambda x: (x - x.mean()) / x.std())
+
+    pd.testing.assert_frame_equal(result[columns], expected.droplevel([0, 1]).loc[df.index])
+    pd.testing.assert_frame_equal(result.drop(columns=columns), df.drop(columns=columns))
+
+
+@pytest.mark.parametrize("labels", [("x", "y"), (2011, 2012)])
+def test_min_max_scale_matches_apply(labels):
+    df = make_frame(labels)
+    columns = list(labels)
+
+    result = groupwise.min_max_scale(df, "g", columns)
+    expected = df.groupby("g")[columns].apply(lambda x: (x - x.min()) / (x.max() - x.min()))
+
+    pd.testing.assert_frame_equal(result[columns], expected.droplevel(0).loc[df.index])
+
+
+def test_standardize_multiindex_columns():
+    df = make_frame()
+    wide_df = pd.concat({"value": df[["x", "y"]], "key": df[["g"]]}, axis=1)
+
+    result = groupwise.standardize(wide_df, [("key", "g")])
+    expected = groupwise.standardize(df, "g", ["x", "y"])
+
+    np.testing.assert_allclose(result["value"].to_numpy(), expected[["x", "y"]].to_numpy())
+
+
+@pytest.mark.parametrize("start, stop, step", [
+    (None, 2, None),
+    (-3, None, None),
+    (1, -1, 2),
+    (10, 16, None),
+    (None, None, 3)
+])
+def test_group_slice_matches_apply(start, stop, step):
+    df = make_frame()
+
+    result = groupwise.group_slice(df, "g", start, stop, step)
+    expected = df.groupby("g", group_keys=False)[df.columns.tolist()].apply(lambda x: x.iloc[start:stop:step])
+
+    pd.testing.assert_frame_equal(result, expected.sort_index())
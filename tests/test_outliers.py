@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_extensions import outliers
+
+
+def reference_flags(x, method, factor):
+    """detect_outliers() written with plain pandas statistics, for one series."""
+    if method == "iqr":
+        q1, q3 = x.quantile([0.25, 0.75])
+        return (x < q1 - factor * (q3 - q1)) | (x > q3 + factor * (q3 - q1))
+    if method == "zscore":
+        return (x - x.mean()).abs() / x.std() > factor
+    deviation = (x - x.median()).abs()
+    return 0.6745 * deviation / deviation.median() > factor
+
+
+def make_data(n=3_000, seed=0):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "total_revenue": rng.lognormal(7, 1, n),
+        "category_2": rng.choice(["Elite Road", "Trail", "Sport", "Fat Bike"], n, p=[0.5, 0.3, 0.19, 0.01]),
+        "city": rng.choice(["Ithaca", "Pittsburgh"], n)
+    })
+    data.loc[rng.choice(n, 30, replace=False), "total_revenue"] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("method, factor", [("iqr", 1.5), ("zscore", 3), ("mad", 3.5), ("iqr", 0.5)])
+def test_detect_outliers_matches_pandas(method, factor):
+    x = make_data()["total_revenue"]
+
+    result = outliers.detect_outliers(x, method=method, factor=factor)
+
+    pd.testing.assert_series_equal(result, reference_flags(x, method, factor))
+
+
+@pytest.mark.parametrize("method", ["iqr", "zscore", "mad"])
+@pytest.mark.parametrize("groups", ["category_2", ["category_2", "city"]])
+def test_detect_outliers_grouped_matches_transform(method, groups):
+    data = make_data()
+    factor = outliers._DEFAULT_FACTORS[method]
+
+    result = outliers.detect_outliers_grouped(data, "total_revenue", groups, method=method)
+    expected = data.groupby(groups)["total_revenue"].transform(
+        lambda x: reference_flags(x, method, factor)
+    ).astype(bool)
+
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_quantile_sketch_close_to_exact_quantiles():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(size=200_000)
+    groups = rng.choice(["a", "b", "c"], len(values))
+    qs = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+    sketch = outliers.QuantileSketch()
+    for start in range(0, len(values), 10_000):
+        sketch.update(values[start:start + 10_000], groups=groups[start:start + 10_000])
+    estimate = sketch.quantile(qs)
+
+    for group in ["a", "b", "c"]:
+        group_values = np.sort(values[groups == group])
+        # Rank error: where the estimate falls among the exact values
+        ranks = np.searchsorted(group_values, estimate.loc[group].to_numpy()) / len(group_values)
+        np.testing.assert_allclose(ranks, qs, atol=0.005)
+        assert sketch._min[sketch.groups.get_loc(group)] == group_values[0]
+
+
+def test_quantile_sketch_single_series_and_missing_values():
+    values = np.r_[np.arange(1, 1001, dtype=float), np.nan]
+
+    sketch = outliers.QuantileSketch().update(values[:500]).update(values[500:])
+
+    assert sketch.quantile(0) == 1
+    assert sketch.quantile(1) == 1000
+    assert abs(sketch.quantile(0.5) - 500.5) < 5
+
+
+def test_approx_flags_close_to_exact():
+    data = make_data(n=20_000)
+
+    exact = outliers.detect_outliers_grouped(data, "total_revenue", "category_2")
+    approx = outliers.detect_outliers_grouped(data, "total_revenue", "category_2", approx=True)
+
+    assert (exact != approx).mean() < 0.005
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pandas_extensions import timeseries
+
+
+def make_orders(n=200, seed=0):
+    """Orderlines-like rows over about two years, with two group columns."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "order_date": pd.Timestamp("2011-01-01") + pd.to_timedelta(rng.integers(0, 700, n), unit="D"),
+        "total_revenue": rng.integers(100, 5000, n).astype(float),
+        "category_1": rng.choice(["Mountain", "Road"], n),
+        "category_2": rng.choice(["Elite Road", "Trail", "Sport"], n)
+    })
+
+
+@pytest.mark.parametrize("groups", [None, "category_2", ["category_1", "category_2"]])
+def test_summarize_by_time_empty_input(groups):
+    empty_df = make_orders().iloc[0:0]
+
+    summary_df = timeseries.summarize_by_time(
+        empty_df, "order_date", "total_revenue", groups=groups, rule="M"
+    )
+
+    assert len(summary_df) == 0
+
+
+def test_summarize_by_time_matches_groupby():
+    df = make_orders()
+
+    summary_df = timeseries.summarize_by_time(
+        df, "order_date", "total_revenue", groups="category_2", rule="M"
+    )
+    expected = (
+        df.groupby([df["order_date"].dt.strftime("%Y-%m"), "category_2"])["total_revenue"]
+        .sum()
+        .unstack("category_2")
+    )
+    # Every month from the first to the last gets a row, months without orders are 0
+    expected = expected.reindex(summary_df.index.strftime("%Y-%m")).fillna(0)
+
+    np.testing.assert_allclose(summary_df[expected.columns].to_numpy(), expected.to_numpy())
+    assert summary_df.index.is_monotonic_increasing
+    assert summary_df.index.min() == df["order_date"].min().to_period("M")
+    assert summary_df.index.max() == df["order_date"].max().to_period("M")
+
+
+def make_wide(seed=1):
+    """Monthly wide data, one column starting later and a gap in another."""
+    rng = np.random.default_rng(seed)
+    wide_df = pd.DataFrame(
+        rng.uniform(10, 100, (30, 3)),
+        index=pd.period_range("2011-01", periods=30, freq="M"),
+        columns=["Elite Road", "Trail", "Sport"]
+    )
+    wide_df.iloc[:5, 1] = np.nan
+    wide_df.iloc[12, 2] = np.nan
+    return wide_df
+
+
+@pytest.mark.parametrize("lag", [1, 3, 12])
+def test_measure_change_lag_methods_match_shift(lag):
+    wide_df = make_wide()
+    previous = wide_df.shift(lag)
+
+    result = timeseries.measure_change(wide_df, method=["diff", "pct_change", "log_return"], lags=lag)
+
+    pd.testing.assert_frame_equal(result[f"diff_{lag}"], wide_df - previous)
+    pd.testing.assert_frame_equal(result[f"pct_change_{lag}"], (wide_df - previous) / previous)
+    pd.testing.assert_frame_equal(result[f"log_return_{lag}"], np.log(wide_df / previous))
+
+
+def test_measure_change_baseline_starts_at_first_valid_value():
+    wide_df = make_wide()
+    first = wide_df.apply(lambda x: x.dropna().iloc[0])
+
+    result = timeseries.measure_change(wide_df, method=["diff_baseline", "pct_baseline"])
+
+    pd.testing.assert_frame_equal(result["diff_baseline"], wide_df - first)
+    pd.testing.assert_frame_equal(result["pct_baseline"], (wide_df - first) / first)
+
+
+def test_measure_change_long_data_matches_groupby():
+    long_df = (
+        make_wide()
+        .rename_axis("order_date")
+        .reset_index()
+        .melt(id_vars="order_date", var_name="category_2", value_name="total_revenue")
+        # Shuffled, date_column puts each series back in time order
+        .sample(frac=1, random_state=0)
+    )
+
+    result = timeseries.measure_change(
+        long_df, "total_revenue", method=["diff", "pct_baseline"], lags=2,
+        groups="category_2", date_column="order_date"
+    )
+
+    grouped = long_df.sort_values("order_date").groupby("category_2")["total_revenue"]
+    diff = grouped.transform(lambda x: x - x.shift(2)).loc[long_df.index]
+    first = grouped.transform(lambda x: x.dropna().iloc[0]).loc[long_df.index]
+    pd.testing.assert_series_equal(result[("diff_2", "total_revenue")], diff, check_names=False)
+    pd.testing.assert_series_equal(
+        result[("pct_baseline", "total_revenue")],
+        (long_df["total_revenue"] - first) / first,
+        check_names=False
+    )
+
+
+def run_updates(agg, wide_df, splits):
+    """Feed wide_df to agg in consecutive blocks of splits rows and stack the results."""
+    bounds = np.cumsum([0] + splits)
+    return pd.concat([agg.update(wide_df.iloc[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])])
+
+
+def assert_matches_pandas(result, wide_df, window, min_periods):
+    """Compare the stacked aggregator results with expanding() and rolling() over the whole history."""
+    for stat in ["sum", "mean", "count"]:
+        pd.testing.assert_frame_equal(
+            result[f"expanding_{stat}"], getattr(wide_df.expanding(), stat)(), check_freq=False
+        )
+        if window is not None:
+            rolling = wide_df.rolling(window, min_periods=min_periods)
+            pd.testing.assert_frame_equal(
+                result[f"rolling_{stat}"], getattr(rolling, stat)(), check_freq=False
+            )
+
+
+@pytest.mark.parametrize("window, min_periods", [(None, None), (4, None), (4, 2), (1, None)])
+@pytest.mark.parametrize("splits", [[30], [1, 2, 27], [10, 3, 17], [0, 30]])
+def test_incremental_aggregator_matches_expanding_and_rolling(window, min_periods, splits):
+    wide_df = make_wide()
+    agg = timeseries.IncrementalAggregator(window, min_periods, stats=["sum", "mean", "count"])
+
+    result = run_updates(agg, wide_df, splits)
+
+    assert_matches_pandas(result, wide_df, window, min_periods)
+
+
+def test_incremental_aggregator_new_series_starts_from_nothing():
+    wide_df = make_wide()
+    agg = timeseries.IncrementalAggregator(4, 2, stats=["sum", "mean", "count"])
+    agg.update(wide_df.iloc[:10])
+
+    late_df = wide_df.iloc[10:].assign(**{"Cross Country": np.arange(20.0)})
+    result = run_updates(agg, late_df, [3, 17])
+
+    # The known series carry their history, the new one behaves like a series starting here
+    history_df = pd.concat([wide_df.iloc[:10], late_df])
+    for stat in ["sum", "mean", "count"]:
+        pd.testing.assert_frame_equal(
+            result[f"rolling_{stat}"],
+            getattr(history_df.rolling(4, min_periods=2), stat)().iloc[10:],
+            check_freq=False
+        )
+        pd.testing.assert_frame_equal(
+            result[f"expanding_{stat}"][["Cross Country"]],
+            getattr(late_df[["Cross Country"]].expanding(), stat)(),
+            check_freq=False
+        )